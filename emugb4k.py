@@ -7,8 +7,9 @@
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import time, os, sys, math
-from threading import Thread, Lock
+import time, os, sys, math, base64, struct, mmap
+from threading import Thread, Event
+from collections import deque
 
 try:
     from PIL import Image, ImageTk, ImageDraw
@@ -16,6 +17,30 @@ try:
 except ImportError:
     PIL = False
 
+# PyPy's JIT traces the pure-Python paths well, while NumPy calls go
+# through its slow C-API emulation — so skip NumPy there.
+PYPY = sys.implementation.name == "pypy"
+
+# Same for a build compiled with `cythonize -i emugb4k.py`: Cython turns
+# the pure-Python paths into C, and Numba cannot take its C functions.
+try:
+    import cython
+    CYTHON = cython.compiled
+except ImportError:
+    CYTHON = False
+
+try:
+    if PYPY or CYTHON: raise ImportError
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    if np is None: raise ImportError
+    import numba
+except ImportError:
+    numba = None
+
 # ─── DMG Palette ──────────────────────────────────────────────────────
 DMG_COLORS = [(0xE8,0xF8,0xD0),(0x88,0xC0,0x70),(0x34,0x68,0x56),(0x08,0x18,0x20)]
 
@@ -24,6 +49,25 @@ INT_VBLANK,INT_STAT,INT_TIMER,INT_SERIAL,INT_JOYPAD = 1,2,4,8,16
 FLAG_Z,FLAG_N,FLAG_H,FLAG_C = 0x80,0x40,0x20,0x10
 GB_W,GB_H = 160,144
 CYCLES_PER_FRAME = 70224
+# PPU frame buffers start with this header so the buffer is a complete PPM image
+PPM_HEADER = f"P6\n{GB_W} {GB_H}\n255\n".encode()
+
+# SWAR tile-row decode: SPREAD8[b] moves bit i of b into the low bit of
+# byte lane 7-i, so SPREAD8[lo] | SPREAD8[hi]<<1 holds all 8 colour
+# indices of a tile row, one per byte, left pixel in the top lane.
+SPREAD8 = [int.from_bytes(bytes((b>>i)&1 for i in range(7,-1,-1)),'big') for b in range(256)]
+def tile_row(lo, hi): return SPREAD8[lo]|(SPREAD8[hi]<<1)
+
+# TILE_ROW_LUT[lo][hi] → the 8 colour indices of a tile row, left to right
+# (built in a function: Cython 3.3 on CPython 3.11 leaks None references
+# from nested comprehensions at module level)
+def _tile_row_lut(): return [[tile_row(lo,hi).to_bytes(8,'big') for hi in range(256)] for lo in range(256)]
+TILE_ROW_LUT = _tile_row_lut()
+_XOR80 = bytes(i^0x80 for i in range(256))   # 0x8800-mode tile ids → cache ids
+
+if np:
+    _X160=np.arange(GB_W)
+    _TILE_ROW_NP=np.frombuffer(b''.join(b for row in TILE_ROW_LUT for b in row),np.uint8).reshape(65536,8)
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -31,7 +75,8 @@ CYCLES_PER_FRAME = 70224
 # ══════════════════════════════════════════════════════════════════════
 class Cartridge:
     def __init__(self, data: bytes):
-        self.rom = bytearray(data)
+        # ROM is never written: bytes and read-only mmaps are used as is
+        self.rom = data if isinstance(data, (bytes, mmap.mmap)) else bytes(data)
         self.ram = bytearray(0x20000)
         self.mbc_type = data[0x0147] if len(data) > 0x0147 else 0
         self.rom_bank = 1
@@ -43,14 +88,25 @@ class Cartridge:
         ri = data[0x0149] if len(data) > 0x0149 else 0
         self.ram_size = [0,2048,8192,32768,131072,65536][ri] if ri<6 else 0
         self.name = ''.join(chr(b) if 0x20<=b<0x7F else '?' for b in data[0x134:0x144]).strip('\x00 ')
+        self.rom0 = self._bank_view(0)
+        self._map_rom()
+
+    def _bank_view(self, bank):
+        off = bank * 0x4000
+        if off + 0x4000 <= len(self.rom): return memoryview(self.rom)[off:off+0x4000]
+        return bytes(self.rom[off:off+0x4000]).ljust(0x4000, b'\xFF')
+
+    def _map_rom(self):
+        # rom0/rom1 are the 16 KB windows at 0x0000/0x4000; the CPU fetches
+        # straight from them, so every rom_bank change must land here
+        self.rom1_bank = self.rom_bank & (self.num_rom_banks - 1)
+        self.rom1 = self._bank_view(self.rom1_bank)
 
     def read(self, a: int) -> int:
         if a < 0x4000:
-            return self.rom[a] if a < len(self.rom) else 0xFF
+            return self.rom0[a]
         elif a < 0x8000:
-            bank = self.rom_bank & (self.num_rom_banks - 1)
-            off = bank * 0x4000 + (a - 0x4000)
-            return self.rom[off] if off < len(self.rom) else 0xFF
+            return self.rom1[a - 0x4000]
         elif 0xA000 <= a < 0xC000:
             if self.ram_enabled and self.ram_size:
                 return self.ram[self.ram_bank*0x2000 + (a-0xA000)]
@@ -71,9 +127,11 @@ class Cartridge:
                     self.rom_bank = (self.rom_bank & 0x60) | lo
                 else:
                     self.rom_bank = lo
+                self._map_rom()
             elif a < 0x6000 and mt <= 3:
                 if self.mode == 0:
                     self.rom_bank = (self.rom_bank & 0x1F) | ((v&3)<<5)
+                    self._map_rom()
                 else:
                     self.ram_bank = v & 3
             elif a < 0x8000 and mt <= 3:
@@ -87,24 +145,22 @@ class Cartridge:
 #  JOYPAD
 # ══════════════════════════════════════════════════════════════════════
 class Joypad:
+    # state: one bit per held key — low nibble A B Select Start, high
+    # nibble Right Left Up Down, i.e. the two P1 rows side by side
+    A,B,SELECT,START,RIGHT,LEFT,UP,DOWN = (1<<i for i in range(8))
     def __init__(self):
-        self.a=self.b=self.sel=self.start=False
-        self.right=self.left=self.up=self.down=False
+        self.state=0
         self._sel_btn=self._sel_dir=False
+    def _key(m):
+        return property(lambda self: bool(self.state&m),
+                        lambda self,on: setattr(self,'state',self.state|m if on else self.state&~m))
+    a=_key(A); b=_key(B); sel=_key(SELECT); start=_key(START)
+    right=_key(RIGHT); left=_key(LEFT); up=_key(UP); down=_key(DOWN)
+    del _key
     def read(self):
-        v = 0xCF
-        if self._sel_btn:
-            v &= ~0x20
-            if self.a:     v &= ~1
-            if self.b:     v &= ~2
-            if self.sel:   v &= ~4
-            if self.start: v &= ~8
-        if self._sel_dir:
-            v &= ~0x10
-            if self.right: v &= ~1
-            if self.left:  v &= ~2
-            if self.up:    v &= ~4
-            if self.down:  v &= ~8
+        v = 0xCF; s = self.state
+        if self._sel_btn: v &= ~(0x20|(s&0xF))
+        if self._sel_dir: v &= ~(0x10|(s>>4))
         return v
     def write(self, v):
         self._sel_btn = not (v & 0x20)
@@ -119,16 +175,19 @@ class Timer:
     def __init__(self):
         self.div=0xABCC; self.tima=0; self.tma=0; self.tac=0
         self._of=False; self._of_d=0
+        # TAC decoded once per write: TIMA enable and the DIV bit it follows
+        self._enabled=False; self._bit=9
     def step(self, cyc):
-        fired = False
         old = self.div
-        self.div = (self.div + cyc) & 0xFFFF
+        self.div = (old + cyc) & 0xFFFF
+        if not (self._enabled or self._of): return False
+        fired = False
         if self._of:
             self._of_d -= cyc
             if self._of_d <= 0:
                 self.tima = self.tma; self._of = False; fired = True
-        if self.tac & 4:
-            bit = self.BITS[self.tac & 3]
+        if self._enabled:
+            bit = self._bit
             if (old>>bit)&1 and not (self.div>>bit)&1:
                 self.tima = (self.tima+1)&0xFF
                 if self.tima == 0: self._of=True; self._of_d=4
@@ -143,27 +202,148 @@ class Timer:
         if a==0xFF04: self.div=0
         elif a==0xFF05: self.tima=v
         elif a==0xFF06: self.tma=v
-        elif a==0xFF07: self.tac=v&7
+        elif a==0xFF07:
+            self.tac=v&7; self._enabled=bool(v&4); self._bit=self.BITS[v&3]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  PPU SCANLINE KERNEL  (Numba, optional)
+# ══════════════════════════════════════════════════════════════════════
+# Same output as PPU._render_bg + the sprite pass, compiled on the first
+# scanline that uses it. Returns the updated window line counter.
+if numba:
+    @numba.njit(cache=True, boundscheck=False)
+    def _render_line_jit(vram, oam, pixels, rgb, ly, lcdc, scx, scy,
+                         bgp, obp0, obp1, wx, wy, win_line):
+        base=ly*GB_W*3
+        bg_idx=np.zeros(GB_W,np.uint8)
+
+        if lcdc&1:
+            tmap=0x1C00 if (lcdc&8) else 0x1800
+            wm=0x1C00 if (lcdc&0x40) else 0x1800
+            signed=not (lcdc&0x10)
+            win_y_ok=(lcdc&0x20)!=0 and ly>=wy
+            sy=(scy+ly)&0xFF
+            for px in range(GB_W):
+                if win_y_ok and px>=wx-7:
+                    tx=px-(wx-7); ty=win_line
+                    ti=int(vram[wm+(ty>>3)*32+(tx>>3)]); row=ty&7; col=tx&7
+                else:
+                    sx=(scx+px)&0xFF
+                    ti=int(vram[tmap+(sy>>3)*32+(sx>>3)]); row=sy&7; col=sx&7
+                if signed: ti^=0x80
+                addr=ti*16+row*2
+                lo=int(vram[addr]); hi=int(vram[addr+1]); bit=7-col
+                c=((hi>>bit)&1)<<1|((lo>>bit)&1)
+                bg_idx[px]=c
+                s=(bgp>>(c*2))&3
+                pixels[base+px*3]=rgb[s,0]; pixels[base+px*3+1]=rgb[s,1]; pixels[base+px*3+2]=rgb[s,2]
+            if win_y_ok: win_line+=1
+
+        if lcdc&2:
+            sh=16 if (lcdc&4) else 8
+            hits=np.empty(10,np.int64); n=0
+            for i in range(40):
+                oy=int(oam[i*4])-16
+                if oy<=ly<oy+sh:
+                    hits[n]=i; n+=1
+                    if n==10: break
+            for k in range(n-1,-1,-1):
+                i=hits[k]
+                oy=int(oam[i*4])-16; ox=int(oam[i*4+1])-8
+                ti=int(oam[i*4+2]); at=int(oam[i*4+3])
+                pal=obp1 if at&0x10 else obp0
+                row=ly-oy
+                if at&0x40: row=(sh-1)-row
+                if sh==16: ti&=0xFE
+                addr=ti*16+row*2
+                lo=int(vram[addr]); hi=int(vram[addr+1])
+                for px in range(8):
+                    sx=ox+px
+                    if sx<0 or sx>=GB_W: continue
+                    bit=px if at&0x20 else 7-px
+                    c=((hi>>bit)&1)<<1|((lo>>bit)&1)
+                    if c==0: continue
+                    if at&0x80 and bg_idx[sx]!=0: continue
+                    s=(pal>>(c*2))&3
+                    pixels[base+sx*3]=rgb[s,0]; pixels[base+sx*3+1]=rgb[s,1]; pixels[base+sx*3+2]=rgb[s,2]
+        return win_line
+else:
+    _render_line_jit = None
 
 
 # ══════════════════════════════════════════════════════════════════════
 #  PPU
 # ══════════════════════════════════════════════════════════════════════
+_MODE_LEN = (204, 456, 80, 172)   # dots spent in modes 0-3
+_BLANK_FRAME = bytes(GB_W*GB_H*3)
+
 class PPU:
-    def __init__(self):
-        self.vram=bytearray(0x2000); self.oam=bytearray(0xA0)
+    def __init__(self, mem=None):
+        # VRAM and OAM are views into the MMU's flat 64 KB map when one is
+        # shared, so plain reads never need to come through the PPU
+        mem=memoryview(bytearray(0x10000) if mem is None else mem)
+        self.vram=mem[0x8000:0xA000]; self.oam=mem[0xFE00:0xFEA0]
         self.lcdc=0x91; self.stat=0x85; self.scy=self.scx=0
         self.ly=0; self.lyc=0
         self.bgp=0xFC; self.obp0=0xFF; self.obp1=0xFF
         self.wy=self.wx=0; self.wx=7
         self.mode=2; self.cycles=0; self.win_line=0
         self._win_active=False
-        self.pixels=bytearray(GB_W*GB_H*3)
+        self._px_off=len(PPM_HEADER)
+        # _render draws into pixels_back; VBlank swaps it with pixels_front.
+        # Both belong to the thread running the core — the GUI only ever
+        # sees copies handed over by it, so no lock is needed
+        self.pixels_front=bytearray(PPM_HEADER)+bytearray(GB_W*GB_H*3)
+        self.pixels_back=bytearray(self.pixels_front)
+        self._drawn=bytearray(GB_H)   # lines of pixels_back drawn since the swap
         self.frame_ready=False
+        self._tabs={}; self._tabs_src=None
+        # cycle count at which the current mode ends; below it step() would
+        # only add cycles, so run_frame does that itself
+        self._limit=0
+        # decoded shade indices per tile (384 tiles × 8 rows × 8 px), kept
+        # in step with VRAM through one dirty flag per tile
+        self._tile_dirty=bytearray(b'\1'*384)
+        if np: self._tiles=np.zeros((384,8,8),np.uint8)
+        else: self._tiles=[[bytes(8)]*8 for _ in range(384)]
+        if np:
+            self._bgp_lut=self._pal_lut(self.bgp)
+            self._rgb_src=None; self._rgb=None
+            self._vram_np=np.frombuffer(self.vram,np.uint8)
+            self._oam_np=np.frombuffer(self.oam,np.uint8)
+            self._oam40=self._oam_np.reshape(40,4)
+            self._px_np=np.frombuffer(self.pixels_back,np.uint8,offset=self._px_off)
+            self._px_np_front=np.frombuffer(self.pixels_front,np.uint8,offset=self._px_off)
 
     def _shade(self, pal, idx):
         s=(pal>>(idx*2))&3; return DMG_COLORS[s]
 
+    @staticmethod
+    def _pal_lut(pal):
+        return np.array([(pal>>s)&3 for s in (0,2,4,6)],np.uint8)
+
+    def invalidate_tiles(self):
+        self._tile_dirty[:]=b'\1'*384
+
+    def _ensure_tile(self, tid):
+        if not self._tile_dirty[tid]: return
+        v=self.vram; o=tid*16
+        if np: self._tiles[tid]=_TILE_ROW_NP[(self._vram_np[o:o+16:2].astype(np.intp)<<8)|self._vram_np[o+1:o+16:2]]
+        else: self._tiles[tid]=[TILE_ROW_LUT[v[i]][v[i+1]] for i in range(o,o+16,2)]
+        self._tile_dirty[tid]=0
+
+    def _refresh_tiles(self):
+        # decode every dirty tile before a scanline reads the cache
+        if np:
+            ids=np.flatnonzero(np.frombuffer(self._tile_dirty,np.uint8))
+            raw=self._vram_np[:0x1800].reshape(384,8,2)[ids]
+            self._tiles[ids]=_TILE_ROW_NP[(raw[...,0].astype(np.intp)<<8)|raw[...,1]]
+            self._tile_dirty[:]=bytes(384)
+        else:
+            d=self._tile_dirty; tid=d.find(1)
+            while tid>=0: self._ensure_tile(tid); tid=d.find(1,tid+1)
+
     def read(self, a):
         if 0x8000<=a<0xA000: return self.vram[a-0x8000]
         if 0xFE00<=a<0xFEA0: return self.oam[a-0xFE00]
@@ -175,25 +355,37 @@ class PPU:
         return d.get(r,0xFF)
 
     def write(self, a, v):
-        if 0x8000<=a<0xA000: self.vram[a-0x8000]=v; return
+        if 0x8000<=a<0xA000:
+            self.vram[a-0x8000]=v
+            if a<0x9800: self._tile_dirty[(a-0x8000)>>4]=1
+            return
         if 0xFE00<=a<0xFEA0: self.oam[a-0xFE00]=v; return
         r=a&0xFF
+        self._limit=0   # LCDC/LY/LYC may change STAT: take the full step() next
         if r==0x40:
-            if not (v&0x80): self.ly=0; self.cycles=0; self.mode=0; self.pixels=bytearray(GB_W*GB_H*3); self.frame_ready=True
+            if not (v&0x80):
+                self.ly=0; self.cycles=0; self.mode=0
+                # blank both buffers in place so the NumPy views stay valid
+                o=self._px_off
+                self.pixels_front[o:]=_BLANK_FRAME; self.pixels_back[o:]=_BLANK_FRAME
+                self.frame_ready=True
             self.lcdc=v
         elif r==0x41: self.stat=(self.stat&0x87)|(v&0x78)
         elif r==0x42: self.scy=v
         elif r==0x43: self.scx=v
         elif r==0x44: self.ly=0
         elif r==0x45: self.lyc=v
-        elif r==0x47: self.bgp=v
+        elif r==0x47:
+            self.bgp=v
+            if np: self._bgp_lut=self._pal_lut(v)
         elif r==0x48: self.obp0=v
         elif r==0x49: self.obp1=v
         elif r==0x4A: self.wy=v
         elif r==0x4B: self.wx=v
 
-    def step(self, cyc):
-        if not (self.lcdc&0x80): return False,False
+    def step(self, cyc) -> int:
+        # → IF bits raised (INT_VBLANK/INT_STAT), 0 most of the time
+        if not (self.lcdc&0x80): return 0
         vb=st=False
         self.cycles+=cyc
         if self.mode==2:
@@ -207,7 +399,8 @@ class PPU:
                 self.cycles-=204; self.ly+=1
                 if self.ly==self.lyc and self.stat&0x40: st=True
                 if self.ly==144:
-                    self.mode=1; vb=True; self.win_line=0; self._win_active=False; self.frame_ready=True
+                    self.mode=1; vb=True; self.win_line=0; self._win_active=False
+                    self._swap_buffers(); self.frame_ready=True
                     if self.stat&0x10: st=True
                 else:
                     self.mode=2
@@ -221,55 +414,50 @@ class PPU:
                     if self.stat&0x20: st=True
         self.stat=(self.stat&0xFC)|self.mode
         self.stat = (self.stat&~4)|(4 if self.ly==self.lyc else 0)
-        return vb,st
+        self._limit=_MODE_LEN[self.mode]
+        return (INT_VBLANK if vb else 0)|(INT_STAT if st else 0)
+
+    def _swap_buffers(self):
+        self.pixels_front,self.pixels_back=self.pixels_back,self.pixels_front
+        self._drawn[:]=bytes(GB_H)
+        if np: self._px_np_front,self._px_np=self._px_np,self._px_np_front
 
     def _render(self):
         ly=self.ly
         if ly>=GB_H: return
-        base=ly*GB_W*3
-        bg_idx=[0]*GB_W
-
-        if self.lcdc&1:
-            tmap  = 0x1C00 if (self.lcdc&8)  else 0x1800
-            tdata = 0x0000 if (self.lcdc&0x10) else 0x0800
-            signed= not (self.lcdc&0x10)
-            win_y_ok = (self.lcdc&0x20) and ly>=self.wy
-
-            for px in range(GB_W):
-                use_win = win_y_ok and px>=(self.wx-7) and (self.lcdc&0x20)
-                if use_win: self._win_active=True
-
-                if use_win and self._win_active:
-                    tx=px-(self.wx-7); ty=self.win_line
-                    wm=0x1C00 if (self.lcdc&0x40) else 0x1800
-                    ti=self.vram[wm+(ty>>3)*32+(tx>>3)]; row=ty&7; col=tx&7
-                else:
-                    sx=(self.scx+px)&0xFF; sy=(self.scy+ly)&0xFF
-                    ti=self.vram[tmap+(sy>>3)*32+(sx>>3)]; row=sy&7; col=sx&7
-
-                if signed:
-                    ti=ti if ti<128 else ti-256
-                    addr=(0x0800+ti*16+row*2)
-                else:
-                    addr=tdata+ti*16+row*2
-
-                if addr<0 or addr+1>=0x2000: continue
-                lo=self.vram[addr]; hi=self.vram[addr+1]
-                bit=7-col
-                c=((hi>>bit)&1)<<1|((lo>>bit)&1)
-                bg_idx[px]=c
-                r,g,b=self._shade(self.bgp,c)
-                self.pixels[base+px*3]=r; self.pixels[base+px*3+1]=g; self.pixels[base+px*3+2]=b
+        if not self.lcdc&1 and not self._drawn[ly]:
+            # with BG off the line keeps what was last drawn there: earlier
+            # in this frame (LY was reset), else in the frame now in front
+            o=self._px_off+ly*GB_W*3
+            self.pixels_back[o:o+GB_W*3]=self.pixels_front[o:o+GB_W*3]
+        self._drawn[ly]=1
+        if _render_line_jit is not None:
+            if self._rgb_src is not DMG_COLORS:
+                self._rgb=np.array(DMG_COLORS,np.uint8); self._rgb_src=DMG_COLORS
+            self.win_line=_render_line_jit(
+                self._vram_np,self._oam_np,self._px_np,self._rgb,ly,self.lcdc,self.scx,self.scy,
+                self.bgp,self.obp0,self.obp1,self.wx,self.wy,self.win_line)
+            return
+        base=self._px_off+ly*GB_W*3
 
-            if win_y_ok: self.win_line+=1
+        if not self.lcdc&1: bg_idx=[0]*GB_W
+        elif np: bg_idx=self._render_bg_np(ly)
+        else: bg_idx=self._render_bg(ly,base)
 
         if self.lcdc&2:
-            sh=16 if (self.lcdc&4) else 8; sprites=[]
-            for i in range(40):
-                oy=self.oam[i*4]-16; ox=self.oam[i*4+1]-8
-                ti=self.oam[i*4+2]; at=self.oam[i*4+3]
-                if oy<=ly<oy+sh: sprites.append((ox,oy,ti,at))
-                if len(sprites)==10: break
+            sh=16 if (self.lcdc&4) else 8
+            if np:
+                # first 10 OAM entries covering this line, found in one pass
+                oy=self._oam40[:,0].astype(np.intp)-16
+                hit=np.flatnonzero((oy<=ly)&(ly<oy+sh))[:10]
+                sprites=[(x-8,y-16,t,a) for y,x,t,a in self._oam40[hit].tolist()]
+            else:
+                sprites=[]
+                for i in range(40):
+                    oy=self.oam[i*4]-16; ox=self.oam[i*4+1]-8
+                    ti=self.oam[i*4+2]; at=self.oam[i*4+3]
+                    if oy<=ly<oy+sh: sprites.append((ox,oy,ti,at))
+                    if len(sprites)==10: break
             for ox,oy,ti,at in reversed(sprites):
                 pal=self.obp1 if at&0x10 else self.obp0
                 fx=at&0x20; fy=at&0x40; prio=at&0x80
@@ -278,37 +466,123 @@ class PPU:
                 if sh==16: ti&=0xFE
                 addr=ti*16+row*2
                 if addr+1>=0x2000: continue
-                lo=self.vram[addr]; hi=self.vram[addr+1]
+                row_px=TILE_ROW_LUT[self.vram[addr]][self.vram[addr+1]]
+                if fx: row_px=row_px[::-1]
                 for px in range(8):
                     sx=ox+px
                     if sx<0 or sx>=GB_W: continue
-                    bit=px if fx else 7-px
-                    c=((hi>>bit)&1)<<1|((lo>>bit)&1)
+                    c=row_px[px]
                     if c==0: continue
                     if prio and bg_idx[sx]!=0: continue
                     r,g,b=self._shade(pal,c)
-                    self.pixels[base+sx*3]=r; self.pixels[base+sx*3+1]=g; self.pixels[base+sx*3+2]=b
+                    self.pixels_back[base+sx*3]=r; self.pixels_back[base+sx*3+1]=g; self.pixels_back[base+sx*3+2]=b
+
+    def _render_bg(self, ly, base):
+        # whole 256-px map rows are decoded tile by tile, then scrolled,
+        # windowed and palette-mapped a channel at a time with translate()
+        if 1 in self._tile_dirty: self._refresh_tiles()
+        lcdc=self.lcdc; signed=not (lcdc&0x10)
+        tmap=0x1C00 if (lcdc&8) else 0x1800
+        row=self._bg_row(tmap,(self.scy+ly)&0xFF,signed)
+        scx=self.scx
+        line=(row[scx:]+row[:scx])[:GB_W]
+
+        if (lcdc&0x20) and ly>=self.wy:
+            wx0=self.wx-7; start=max(wx0,0)
+            if start<GB_W:
+                wm=0x1C00 if (lcdc&0x40) else 0x1800
+                line=line[:start]+self._bg_row(wm,self.win_line,signed)[start-wx0:GB_W-wx0]
+            self.win_line+=1
+
+        tr,tg,tb=self._pal_tabs(self.bgp)
+        px=self.pixels_back; end=base+GB_W*3
+        px[base:end:3]=line.translate(tr)
+        px[base+1:end:3]=line.translate(tg)
+        px[base+2:end:3]=line.translate(tb)
+        return line
+
+    def _bg_row(self, tmap, y, signed):
+        o=tmap+(y>>3)*32; r=y&7
+        ids=bytes(self.vram[o:o+32])
+        if signed: ids=ids.translate(_XOR80)
+        tiles=self._tiles
+        return b''.join([tiles[t][r] for t in ids])
+
+    def _pal_tabs(self, pal):
+        # colour index → R/G/B byte tables for bytes.translate
+        if self._tabs_src is not DMG_COLORS:
+            self._tabs={}; self._tabs_src=DMG_COLORS
+        tabs=self._tabs.get(pal)
+        if tabs is None:
+            cols=[DMG_COLORS[(pal>>(i*2))&3] for i in range(4)]
+            tabs=self._tabs[pal]=tuple(bytes(c[ch] for c in cols).ljust(256,b'\0') for ch in range(3))
+        return tabs
+
+    # ── NumPy scanline path ────────────────────────────────────
+    def _tile_row(self, tmap, y, signed):
+        ids=np.frombuffer(self.vram,np.uint8,32,tmap+(y>>3)*32)
+        if signed: ids=ids^0x80
+        return self._tiles[ids,y&7].reshape(256)
+
+    def _render_bg_np(self, ly):
+        if 1 in self._tile_dirty: self._refresh_tiles()
+        lcdc=self.lcdc; signed=not (lcdc&0x10)
+        tmap=0x1C00 if (lcdc&8) else 0x1800
+        line=self._tile_row(tmap,(self.scy+ly)&0xFF,signed)[(_X160+self.scx)&0xFF]
+
+        if (lcdc&0x20) and ly>=self.wy:
+            wx0=self.wx-7; start=max(wx0,0)
+            if start<GB_W:
+                wm=0x1C00 if (lcdc&0x40) else 0x1800
+                line[start:]=self._tile_row(wm,self.win_line,signed)[start-wx0:GB_W-wx0]
+            self.win_line+=1
+
+        if self._rgb_src is not DMG_COLORS:
+            self._rgb=np.array(DMG_COLORS,np.uint8); self._rgb_src=DMG_COLORS
+        px=self._px_np.reshape(GB_H,GB_W,3)
+        px[ly]=self._rgb[self._bgp_lut][line]
+        return line
 
 
 # ══════════════════════════════════════════════════════════════════════
 #  MMU
 # ══════════════════════════════════════════════════════════════════════
 class MMU:
-    def __init__(self, cart, ppu, timer, joy):
+    def __init__(self, cart, ppu, timer, joy, mem=None):
         self.cart=cart; self.ppu=ppu; self.timer=timer; self.joy=joy
-        self.wram=bytearray(0x2000); self.hram=bytearray(0x80)
+        # flat 64 KB map: WRAM, VRAM, OAM and HRAM live here (the PPU
+        # shares the VRAM/OAM views); ROM and cart RAM stay in Cartridge
+        self.mem=bytearray(0x10000) if mem is None else mem
+        self.wram=memoryview(self.mem)[0xC000:0xE000]
+        self.hram=memoryview(self.mem)[0xFF80:0x10000]
         self.IE=0; self.IF=0xE1
         self._sb=0; self._sc=0
-
+        # 0xFF00-0xFFFF write handlers, indexed by the low address byte
+        w=[self._wb_nop]*256
+        w[0x00]=lambda a,v: self.joy.write(v)
+        w[0x01]=self._wb_sb; w[0x02]=self._wb_sc
+        for r in range(0x04,0x08): w[r]=timer.write
+        w[0x0F]=self._wb_if
+        for r in range(0x40,0x4C): w[r]=ppu.write
+        w[0x46]=lambda a,v: self._dma(v)
+        for r in range(0x80,0xFF): w[r]=self._wb_mem
+        w[0xFF]=self._wb_ie
+        self._io_write=w
+
+    # Everything but ROM, cart RAM and the IO registers is one index
+    # into mem; the echo area folds back onto WRAM first.
     def rb(self, a):
         a&=0xFFFF
-        if a<0x8000:   return self.cart.read(a)
-        if a<0xA000:   return self.ppu.read(a)
+        if a<0x8000:   return self.cart.rom0[a] if a<0x4000 else self.cart.rom1[a-0x4000]
+        if a>=0xFF00:  return self.mem[a] if 0xFF80<=a<0xFFFF else self._rb_io(a)
+        if a<0xA000:   return self.mem[a]
         if a<0xC000:   return self.cart.read(a)
-        if a<0xE000:   return self.wram[a-0xC000]
-        if a<0xFE00:   return self.wram[a-0xE000]
-        if a<0xFEA0:   return self.ppu.read(a)
-        if a<0xFF00:   return 0xFF
+        if a<0xE000:   return self.mem[a]
+        if a<0xFE00:   return self.mem[a-0x2000]
+        if a<0xFEA0:   return self.mem[a]
+        return 0xFF
+
+    def _rb_io(self, a):
         if a==0xFF00:  return self.joy.read()
         if 0xFF01<=a<=0xFF02:
             return self._sb if a==0xFF01 else self._sc
@@ -316,32 +590,35 @@ class MMU:
         if a==0xFF0F:  return self.IF|0xE0
         if 0xFF10<=a<0xFF40: return 0xFF  # APU stub
         if 0xFF40<=a<=0xFF4B: return self.ppu.read(a)
-        if 0xFF80<=a<0xFFFF: return self.hram[a-0xFF80]
         if a==0xFFFF:  return self.IE
         return 0xFF
 
     def wb(self, a, v):
         a&=0xFFFF; v&=0xFF
         if a<0x8000:   self.cart.write(a,v); return
+        if a>=0xFF00:  self._io_write[a&0xFF](a,v); return
         if a<0xA000:   self.ppu.write(a,v); return
         if a<0xC000:   self.cart.write(a,v); return
-        if a<0xE000:   self.wram[a-0xC000]=v; return
-        if a<0xFE00:   self.wram[a-0xE000]=v; return
-        if a<0xFEA0:   self.ppu.write(a,v); return
-        if a<0xFF00:   return
-        if a==0xFF00:  self.joy.write(v); return
-        if a==0xFF01:  self._sb=v; return
-        if a==0xFF02:  self._sc=v; return
-        if 0xFF04<=a<=0xFF07: self.timer.write(a,v); return
-        if a==0xFF0F:  self.IF=v&0x1F; return
-        if a==0xFF46:  # DMA
-            src=v<<8
-            for i in range(0xA0): self.ppu.oam[i]=self.rb(src+i)
-            return
-        if 0xFF10<=a<0xFF40: return  # APU stub
-        if 0xFF40<=a<=0xFF4B: self.ppu.write(a,v); return
-        if 0xFF80<=a<0xFFFF: self.hram[a-0xFF80]=v; return
-        if a==0xFFFF:  self.IE=v; return
+        if a<0xE000:   self.mem[a]=v; return
+        if a<0xFE00:   self.mem[a-0x2000]=v; return
+        if a<0xFEA0:   self.mem[a]=v
+
+    # ── IO write handlers ──────────────────────────────────────
+    def _wb_nop(self, a, v): pass
+    def _wb_mem(self, a, v): self.mem[a]=v
+    def _wb_sb(self, a, v): self._sb=v
+    def _wb_sc(self, a, v): self._sc=v
+    def _wb_if(self, a, v): self.IF=v&0x1F
+    def _wb_ie(self, a, v): self.IE=v
+
+    def _dma(self, v):
+        # src is page aligned, so the 160 bytes never straddle a region:
+        # ROM and WRAM sources are one slice copy, the rest go byte by byte
+        src=v<<8; oam=self.ppu.oam
+        if src<0x4000: oam[:]=self.cart.rom0[src:src+0xA0]; return
+        if src<0x8000: oam[:]=self.cart.rom1[src-0x4000:src-0x3F60]; return
+        if 0xC000<=src<0xE000: oam[:]=self.mem[src:src+0xA0]; return
+        for i in range(0xA0): oam[i]=self.rb(src+i)
 
     def rw(self, a): return self.rb(a)|(self.rb((a+1)&0xFFFF)<<8)
     def ww(self, a, v): self.wb(a,v&0xFF); self.wb((a+1)&0xFFFF,(v>>8)&0xFF)
@@ -350,100 +627,176 @@ class MMU:
 # ══════════════════════════════════════════════════════════════════════
 #  SM83 CPU  (complete opcode coverage)
 # ══════════════════════════════════════════════════════════════════════
+# ── Opcode dispatch tables ─────────────────────────────────
+# Filled at CPU class-body time by the @_op decorator; unlisted opcodes
+# behave as 4-cycle NOPs.
+_OP_TABLE = [lambda cpu: None]*256
+_CYCLES   = [4]*256
+
+def _op(code, cyc=4):
+    def reg(fn):
+        _OP_TABLE[code]=fn; _CYCLES[code]=cyc
+        return fn
+    return reg
+
+# CB-prefixed ops; cycle counts include the prefix fetch
+_CB_TABLE  = [None]*256
+_CB_CYCLES = [16 if _o&7==6 else 12 for _o in range(256)]
+
+# ── Register file layout ───────────────────────────────────
+A,F,B,C,D,E,H,L = range(8)
+_R8 = (B,C,D,E,H,L,None,A)
+
+# ── ALU result/flag tables ─────────────────────────────────
+# _ADD_LUT/_SUB_LUT[(carry<<16)|(a<<8)|v] → (result, Z, H, C);
+# _INC_LUT/_DEC_LUT[v] → (result, Z, H). Equal tuples are shared, so the
+# two 128K-entry tables cost little more than their list slots.
+def _add_entry(i):
+    c=i>>16; a=(i>>8)&0xFF; v=i&0xFF; r=a+v+c
+    return (r&0xFF,(r&0xFF)==0,(a&0xF)+(v&0xF)+c>0xF,r>0xFF)
+def _sub_entry(i):
+    c=i>>16; a=(i>>8)&0xFF; v=i&0xFF; r=a-v-c
+    return (r&0xFF,(r&0xFF)==0,(a&0xF)-(v&0xF)-c<0,r<0)
+def _alu_lut(entry, n):
+    seen={}; return [seen.setdefault(t,t) for t in map(entry,range(n))]
+_ADD_LUT = _alu_lut(_add_entry, 0x20000)
+_SUB_LUT = _alu_lut(_sub_entry, 0x20000)
+_INC_LUT = [((v+1)&0xFF,((v+1)&0xFF)==0,(v&0xF)==0xF) for v in range(256)]
+_DEC_LUT = [((v-1)&0xFF,((v-1)&0xFF)==0,(v&0xF)==0) for v in range(256)]
+
+# Each of the 64 LD r,r and 64 ALU A,r opcodes gets its own closure with
+# the register indices baked in, so no operand decoding happens at run time.
+def _ld_r_r(dst, src):
+    if src==6:
+        d=_R8[dst]
+        def op(cpu): cpu.reg[d]=cpu._rb(cpu._hl())
+    elif dst==6:
+        s=_R8[src]
+        def op(cpu): cpu._wb(cpu._hl(),cpu.reg[s])
+    else:
+        d=_R8[dst]; s=_R8[src]
+        def op(cpu): reg=cpu.reg; reg[d]=reg[s]
+    return op
+
+def _alu_r(alu, src):
+    if src==6:
+        def op(cpu): alu(cpu,cpu._rb(cpu._hl()))
+    else:
+        s=_R8[src]
+        def op(cpu): alu(cpu,cpu.reg[s])
+    return op
+
+def _cb_op(grp, bit, src, shift):
+    m=1<<bit
+    if src==6:
+        if grp==0:
+            def op(cpu): a=cpu._hl(); cpu._wb(a,shift(cpu,cpu._rb(a)))
+        elif grp==1:
+            def op(cpu): cpu._fz=not cpu._rb(cpu._hl())&m; cpu._fn=0; cpu._fh=1
+        elif grp==2:
+            def op(cpu): a=cpu._hl(); cpu._wb(a,cpu._rb(a)&~m)
+        else:
+            def op(cpu): a=cpu._hl(); cpu._wb(a,cpu._rb(a)|m)
+        return op
+    s=_R8[src]
+    if grp==0:
+        def op(cpu): reg=cpu.reg; reg[s]=shift(cpu,reg[s])
+    elif grp==1:
+        def op(cpu): cpu._fz=not cpu.reg[s]&m; cpu._fn=0; cpu._fh=1
+    elif grp==2:
+        m^=0xFF
+        def op(cpu): cpu.reg[s]&=m
+    else:
+        def op(cpu): cpu.reg[s]|=m
+    return op
+
+
 class CPU:
     def __init__(self, mmu):
-        self.mmu=mmu
+        self.mmu=mmu; self.cart=mmu.cart
+        self._rb=mmu.rb; self._wb=mmu.wb; self._rw=mmu.rw; self._ww=mmu.ww
         self.pc=0x0100; self.sp=0xFFFE
-        self.a=0x01; self.f=0xB0
-        self.b=0x00; self.c=0x13
-        self.d=0x00; self.e=0xD8
-        self.h=0x01; self.l=0x4D
+        # A F B C D E H L, indexed by the module-level register constants
+        self.reg=[0x01,0xB0,0x00,0x13,0x00,0xD8,0x01,0x4D]
+        self._set_f(self.reg[F])
         self.halted=False; self.ime=False; self._ime_pending=0
         self.cycles=0
 
     # ── Flag helpers ───────────────────────────────────────────
-    def _zf(self): return bool(self.f&0x80)
-    def _nf(self): return bool(self.f&0x40)
-    def _hf(self): return bool(self.f&0x20)
-    def _cf(self): return bool(self.f&0x10)
-    def _sf(self,z=0,n=0,h=0,c=0):
-        self.f=(0x80 if z else 0)|(0x40 if n else 0)|(0x20 if h else 0)|(0x10 if c else 0)
+    # Z N H C live in _fz/_fn/_fh/_fc (0/1 or bool); the packed F byte
+    # is only built when something reads it (PUSH AF, save states).
+    # reg[F] is not kept in sync.
+    def _get_f(self):
+        return (self._fz<<7)|(self._fn<<6)|(self._fh<<5)|(self._fc<<4)
+    def _set_f(self,v):
+        self._fz=(v>>7)&1; self._fn=(v>>6)&1; self._fh=(v>>5)&1; self._fc=(v>>4)&1
 
     # ── 16-bit reg helpers ─────────────────────────────────────
-    def _af(self): return (self.a<<8)|(self.f&0xF0)
-    def _bc(self): return (self.b<<8)|self.c
-    def _de(self): return (self.d<<8)|self.e
-    def _hl(self): return (self.h<<8)|self.l
-    def _set_af(self,v): v&=0xFFF0; self.a=(v>>8)&0xFF; self.f=v&0xFF
-    def _set_bc(self,v): self.b=(v>>8)&0xFF; self.c=v&0xFF
-    def _set_de(self,v): self.d=(v>>8)&0xFF; self.e=v&0xFF
-    def _set_hl(self,v): self.h=(v>>8)&0xFF; self.l=v&0xFF
-
-    def _r8(self, reg):
-        return [self.b,self.c,self.d,self.e,self.h,self.l,self.mmu.rb(self._hl()),self.a][reg]
-    def _w8(self, reg, v):
-        v&=0xFF
-        if reg==0: self.b=v
-        elif reg==1: self.c=v
-        elif reg==2: self.d=v
-        elif reg==3: self.e=v
-        elif reg==4: self.h=v
-        elif reg==5: self.l=v
-        elif reg==6: self.mmu.wb(self._hl(),v)
-        elif reg==7: self.a=v
-
+    def _af(self): return (self.reg[A]<<8)|self._get_f()
+    def _bc(self): reg=self.reg; return (reg[B]<<8)|reg[C]
+    def _de(self): reg=self.reg; return (reg[D]<<8)|reg[E]
+    def _hl(self): reg=self.reg; return (reg[H]<<8)|reg[L]
+    def _set_af(self,v): self.reg[A]=(v>>8)&0xFF; self._set_f(v)
+    def _set_bc(self,v): reg=self.reg; reg[B]=(v>>8)&0xFF; reg[C]=v&0xFF
+    def _set_de(self,v): reg=self.reg; reg[D]=(v>>8)&0xFF; reg[E]=v&0xFF
+    def _set_hl(self,v): reg=self.reg; reg[H]=(v>>8)&0xFF; reg[L]=v&0xFF
+
+    # r8 operand encoding (B C D E H L (HL) A) → index into self.reg
+    def _r8(self, r):
+        if r==6: return self._rb(self._hl())
+        return self.reg[_R8[r]]
+    def _w8(self, r, v):
+        if r==6: self._wb(self._hl(),v&0xFF)
+        else: self.reg[_R8[r]]=v&0xFF
+
+    # PC is in ROM almost always, so read the mapped bank windows directly
+    # and only go through the MMU for code running from RAM
     def _fetch(self):
-        v=self.mmu.rb(self.pc); self.pc=(self.pc+1)&0xFFFF; return v
+        pc=self.pc; self.pc=(pc+1)&0xFFFF
+        if pc<0x4000: return self.cart.rom0[pc]
+        if pc<0x8000: return self.cart.rom1[pc-0x4000]
+        return self._rb(pc)
     def _fetch16(self):
+        pc=self.pc
+        if pc<0x3FFF: self.pc=pc+2; r=self.cart.rom0; return r[pc]|(r[pc+1]<<8)
+        if 0x4000<=pc<0x7FFF: self.pc=pc+2; r=self.cart.rom1; pc-=0x4000; return r[pc]|(r[pc+1]<<8)
         lo=self._fetch(); hi=self._fetch(); return lo|(hi<<8)
 
     # ── ADD/ADC/SUB/SBC/AND/XOR/OR/CP (ALU) ───────────────────
     def _add(self,v,carry=0):
-        r=self.a+v+carry
-        self._sf(z=(r&0xFF)==0,n=0,h=((self.a&0xF)+(v&0xF)+carry)>0xF,c=r>0xFF)
-        self.a=r&0xFF
+        reg=self.reg; reg[A],self._fz,self._fh,self._fc=_ADD_LUT[(carry<<16)|(reg[A]<<8)|v]; self._fn=0
     def _sub(self,v,carry=0):
-        r=self.a-v-carry
-        self._sf(z=(r&0xFF)==0,n=1,h=((self.a&0xF)-(v&0xF)-carry)<0,c=r<0)
-        self.a=r&0xFF
-    def _and(self,v): self.a&=v; self._sf(z=self.a==0,n=0,h=1,c=0)
-    def _xor(self,v): self.a^=v; self._sf(z=self.a==0,n=0,h=0,c=0)
-    def _or(self,v):  self.a|=v; self._sf(z=self.a==0,n=0,h=0,c=0)
+        reg=self.reg; reg[A],self._fz,self._fh,self._fc=_SUB_LUT[(carry<<16)|(reg[A]<<8)|v]; self._fn=1
+    def _adc(self,v): self._add(v,self._fc)
+    def _sbc(self,v): self._sub(v,self._fc)
+    def _and(self,v): self.reg[A]&=v; self._fz=self.reg[A]==0; self._fn=0; self._fh=1; self._fc=0
+    def _xor(self,v): self.reg[A]^=v; self._fz=self.reg[A]==0; self._fn=0; self._fh=0; self._fc=0
+    def _or(self,v):  self.reg[A]|=v; self._fz=self.reg[A]==0; self._fn=0; self._fh=0; self._fc=0
     def _cp(self,v):
-        r=self.a-v; self._sf(z=(r&0xFF)==0,n=1,h=((self.a&0xF)-(v&0xF))<0,c=r<0)
+        _,self._fz,self._fh,self._fc=_SUB_LUT[(self.reg[A]<<8)|v]; self._fn=1
 
     def _add_hl(self,v):
         hl=self._hl(); r=hl+v
         h=((hl&0xFFF)+(v&0xFFF))>0xFFF
-        self._sf(z=self._zf(),n=0,h=h,c=r>0xFFFF)
+        self._fn=0; self._fh=h; self._fc=r>0xFFFF
         self._set_hl(r&0xFFFF)
 
     def _inc8(self,v):
-        r=(v+1)&0xFF; self._sf(z=r==0,n=0,h=(v&0xF)==0xF,c=self._cf()); return r
+        r,self._fz,self._fh=_INC_LUT[v]; self._fn=0; return r
     def _dec8(self,v):
-        r=(v-1)&0xFF; self._sf(z=r==0,n=1,h=(v&0xF)==0,c=self._cf()); return r
-
-    def _rl(self,v,thru=True):
-        c=self._cf() if thru else (v>>7)&1
-        r=((v<<1)|(1 if (self._cf() if thru else c) else 0))&0xFF if thru else ((v<<1)|c)&0xFF
-        if thru: r=((v<<1)|(1 if self._cf() else 0))&0xFF
-        else:    r=((v<<1)|c)&0xFF
-        self._sf(z=r==0,n=0,h=0,c=bool(v&0x80)); return r
-    def _rr(self,v,thru=True):
-        c=(v&1)
-        if thru: r=((v>>1)|(0x80 if self._cf() else 0))&0xFF
-        else:    r=((v>>1)|(c<<7))&0xFF
-        self._sf(z=r==0,n=0,h=0,c=bool(c)); return r
-    def _sla(self,v): r=(v<<1)&0xFF; self._sf(z=r==0,n=0,h=0,c=bool(v&0x80)); return r
-    def _sra(self,v): r=((v>>1)|(v&0x80))&0xFF; self._sf(z=r==0,n=0,h=0,c=bool(v&1)); return r
-    def _srl(self,v): r=(v>>1)&0xFF; self._sf(z=r==0,n=0,h=0,c=bool(v&1)); return r
-    def _swap(self,v): r=((v&0xF)<<4)|((v>>4)&0xF); self._sf(z=r==0,n=0,h=0,c=0); return r
-    def _bit(self,n,v): self._sf(z=not bool(v&(1<<n)),n=0,h=1,c=self._cf())
-    def _set_b(self,n,v): return v|(1<<n)
-    def _res_b(self,n,v): return v&~(1<<n)
-
-    def _push(self,v): self.sp=(self.sp-2)&0xFFFF; self.mmu.ww(self.sp,v)
-    def _pop(self): v=self.mmu.rw(self.sp); self.sp=(self.sp+2)&0xFFFF; return v
+        r,self._fz,self._fh=_DEC_LUT[v]; self._fn=1; return r
+
+    def _rlc(self,v): r=((v<<1)|(v>>7))&0xFF; self._fz=r==0; self._fn=0; self._fh=0; self._fc=v>>7; return r
+    def _rrc(self,v): r=(v>>1)|((v&1)<<7); self._fz=r==0; self._fn=0; self._fh=0; self._fc=v&1; return r
+    def _rl(self,v):  r=((v<<1)|self._fc)&0xFF; self._fz=r==0; self._fn=0; self._fh=0; self._fc=v>>7; return r
+    def _rr(self,v):  r=(v>>1)|(self._fc<<7); self._fz=r==0; self._fn=0; self._fh=0; self._fc=v&1; return r
+    def _sla(self,v): r=(v<<1)&0xFF; self._fz=r==0; self._fn=0; self._fh=0; self._fc=bool(v&0x80); return r
+    def _sra(self,v): r=((v>>1)|(v&0x80))&0xFF; self._fz=r==0; self._fn=0; self._fh=0; self._fc=bool(v&1); return r
+    def _srl(self,v): r=(v>>1)&0xFF; self._fz=r==0; self._fn=0; self._fh=0; self._fc=bool(v&1); return r
+    def _swap(self,v): r=((v&0xF)<<4)|((v>>4)&0xF); self._fz=r==0; self._fn=0; self._fh=0; self._fc=0; return r
+
+    def _push(self,v): self.sp=(self.sp-2)&0xFFFF; self._ww(self.sp,v)
+    def _pop(self): v=self._rw(self.sp); self.sp=(self.sp+2)&0xFFFF; return v
 
     def _call(self,a): self._push((self.pc)&0xFFFF); self.pc=a
     def _ret(self): self.pc=self._pop()
@@ -454,7 +807,7 @@ class CPU:
     def _sp_add(self, v):
         sv=(v^0x80)-0x80
         r=(self.sp+sv)&0xFFFF
-        self._sf(z=0,n=0,h=((self.sp&0xF)+(v&0xF))>0xF,c=((self.sp&0xFF)+(v&0xFF))>0xFF)
+        self._fz=0; self._fn=0; self._fh=((self.sp&0xF)+(v&0xF))>0xF; self._fc=((self.sp&0xFF)+(v&0xFF))>0xFF
         return r
 
     # ── Interrupt handling ─────────────────────────────────────
@@ -479,215 +832,737 @@ class CPU:
         self.handle_interrupts()
         if self.halted: self.cycles+=4; return
 
-        op=self._fetch(); c=4
-
-        # ─ Main opcode table ───────────────────────────────────
-        if op==0x00: pass  # NOP
-        elif op==0x01: self._set_bc(self._fetch16()); c=12
-        elif op==0x02: self.mmu.wb(self._bc(),self.a); c=8
-        elif op==0x03: self._set_bc((self._bc()+1)&0xFFFF); c=8
-        elif op==0x04: self.b=self._inc8(self.b)
-        elif op==0x05: self.b=self._dec8(self.b)
-        elif op==0x06: self.b=self._fetch(); c=8
-        elif op==0x07: # RLCA
-            c2=self.a>>7; self.a=((self.a<<1)|c2)&0xFF; self._sf(z=0,n=0,h=0,c=bool(c2))
-        elif op==0x08: # LD (nn),SP
-            a=self._fetch16(); self.mmu.ww(a,self.sp); c=20
-        elif op==0x09: self._add_hl(self._bc()); c=8
-        elif op==0x0A: self.a=self.mmu.rb(self._bc()); c=8
-        elif op==0x0B: self._set_bc((self._bc()-1)&0xFFFF); c=8
-        elif op==0x0C: self.c=self._inc8(self.c)
-        elif op==0x0D: self.c=self._dec8(self.c)
-        elif op==0x0E: self.c=self._fetch(); c=8
-        elif op==0x0F: # RRCA
-            c2=self.a&1; self.a=((self.a>>1)|(c2<<7))&0xFF; self._sf(z=0,n=0,h=0,c=bool(c2))
-        elif op==0x10: self._fetch(); c=4  # STOP
-        elif op==0x11: self._set_de(self._fetch16()); c=12
-        elif op==0x12: self.mmu.wb(self._de(),self.a); c=8
-        elif op==0x13: self._set_de((self._de()+1)&0xFFFF); c=8
-        elif op==0x14: self.d=self._inc8(self.d)
-        elif op==0x15: self.d=self._dec8(self.d)
-        elif op==0x16: self.d=self._fetch(); c=8
-        elif op==0x17: # RLA
-            c2=self._cf(); nc=self.a>>7; self.a=((self.a<<1)|(1 if c2 else 0))&0xFF; self._sf(z=0,n=0,h=0,c=bool(nc))
-        elif op==0x18: self._jr(self._fetch()); c=12
-        elif op==0x19: self._add_hl(self._de()); c=8
-        elif op==0x1A: self.a=self.mmu.rb(self._de()); c=8
-        elif op==0x1B: self._set_de((self._de()-1)&0xFFFF); c=8
-        elif op==0x1C: self.e=self._inc8(self.e)
-        elif op==0x1D: self.e=self._dec8(self.e)
-        elif op==0x1E: self.e=self._fetch(); c=8
-        elif op==0x1F: # RRA
-            c2=self.a&1; nc=self._cf(); self.a=((self.a>>1)|(0x80 if nc else 0))&0xFF; self._sf(z=0,n=0,h=0,c=bool(c2))
-        elif op==0x20: # JR NZ
-            d=self._fetch(); c=8
-            if not self._zf(): self._jr(d); c=12
-        elif op==0x21: self._set_hl(self._fetch16()); c=12
-        elif op==0x22: self.mmu.wb(self._hl(),self.a); self._set_hl((self._hl()+1)&0xFFFF); c=8
-        elif op==0x23: self._set_hl((self._hl()+1)&0xFFFF); c=8
-        elif op==0x24: self.h=self._inc8(self.h)
-        elif op==0x25: self.h=self._dec8(self.h)
-        elif op==0x26: self.h=self._fetch(); c=8
-        elif op==0x27: # DAA
-            a=self.a
-            if not self._nf():
-                if self._hf() or (a&0xF)>9: a+=6
-                if self._cf() or a>0x99: a+=0x60; self.f|=0x10
-            else:
-                if self._hf(): a-=6
-                if self._cf(): a-=0x60
-            self.a=a&0xFF; self.f=(self.f&~0xA0)|(0x80 if self.a==0 else 0)
-        elif op==0x28: # JR Z
-            d=self._fetch(); c=8
-            if self._zf(): self._jr(d); c=12
-        elif op==0x29: self._add_hl(self._hl()); c=8
-        elif op==0x2A: self.a=self.mmu.rb(self._hl()); self._set_hl((self._hl()+1)&0xFFFF); c=8
-        elif op==0x2B: self._set_hl((self._hl()-1)&0xFFFF); c=8
-        elif op==0x2C: self.l=self._inc8(self.l)
-        elif op==0x2D: self.l=self._dec8(self.l)
-        elif op==0x2E: self.l=self._fetch(); c=8
-        elif op==0x2F: self.a^=0xFF; self.f|=0x60
-        elif op==0x30: # JR NC
-            d=self._fetch(); c=8
-            if not self._cf(): self._jr(d); c=12
-        elif op==0x31: self.sp=self._fetch16(); c=12
-        elif op==0x32: self.mmu.wb(self._hl(),self.a); self._set_hl((self._hl()-1)&0xFFFF); c=8
-        elif op==0x33: self.sp=(self.sp+1)&0xFFFF; c=8
-        elif op==0x34: hl=self._hl(); self.mmu.wb(hl,self._inc8(self.mmu.rb(hl))); c=12
-        elif op==0x35: hl=self._hl(); self.mmu.wb(hl,self._dec8(self.mmu.rb(hl))); c=12
-        elif op==0x36: self.mmu.wb(self._hl(),self._fetch()); c=12
-        elif op==0x37: self._sf(z=self._zf(),n=0,h=0,c=1)
-        elif op==0x38: # JR C
-            d=self._fetch(); c=8
-            if self._cf(): self._jr(d); c=12
-        elif op==0x39: self._add_hl(self.sp); c=8
-        elif op==0x3A: self.a=self.mmu.rb(self._hl()); self._set_hl((self._hl()-1)&0xFFFF); c=8
-        elif op==0x3B: self.sp=(self.sp-1)&0xFFFF; c=8
-        elif op==0x3C: self.a=self._inc8(self.a)
-        elif op==0x3D: self.a=self._dec8(self.a)
-        elif op==0x3E: self.a=self._fetch(); c=8
-        elif op==0x3F: self._sf(z=self._zf(),n=0,h=0,c=not self._cf())
-        elif 0x40<=op<=0x7F:  # LD r,r / HALT
-            if op==0x76: self.halted=True
-            else:
-                dst=(op-0x40)>>3; src=op&7
-                v=self._r8(src); self._w8(dst,v)
-                c=8 if (src==6 or dst==6) else 4
-        elif 0x80<=op<=0x87: self._add(self._r8(op&7)); c=4+(4 if (op&7)==6 else 0)
-        elif 0x88<=op<=0x8F: self._add(self._r8(op&7),int(self._cf())); c=4+(4 if (op&7)==6 else 0)
-        elif 0x90<=op<=0x97: self._sub(self._r8(op&7)); c=4+(4 if (op&7)==6 else 0)
-        elif 0x98<=op<=0x9F: self._sub(self._r8(op&7),int(self._cf())); c=4+(4 if (op&7)==6 else 0)
-        elif 0xA0<=op<=0xA7: self._and(self._r8(op&7)); c=4+(4 if (op&7)==6 else 0)
-        elif 0xA8<=op<=0xAF: self._xor(self._r8(op&7)); c=4+(4 if (op&7)==6 else 0)
-        elif 0xB0<=op<=0xB7: self._or(self._r8(op&7)); c=4+(4 if (op&7)==6 else 0)
-        elif 0xB8<=op<=0xBF: self._cp(self._r8(op&7)); c=4+(4 if (op&7)==6 else 0)
-        elif op==0xC0: # RET NZ
-            c=8
-            if not self._zf(): self._ret(); c=20
-        elif op==0xC1: self._set_bc(self._pop()); c=12
-        elif op==0xC2: # JP NZ
-            a=self._fetch16(); c=12
-            if not self._zf(): self.pc=a; c=16
-        elif op==0xC3: self.pc=self._fetch16(); c=16
-        elif op==0xC4: # CALL NZ
-            a=self._fetch16(); c=12
-            if not self._zf(): self._call(a); c=24
-        elif op==0xC5: self._push(self._bc()); c=16
-        elif op==0xC6: self._add(self._fetch()); c=8
-        elif op==0xC7: self._call(0x00); c=16
-        elif op==0xC8: # RET Z
-            c=8
-            if self._zf(): self._ret(); c=20
-        elif op==0xC9: self._ret(); c=16
-        elif op==0xCA: # JP Z
-            a=self._fetch16(); c=12
-            if self._zf(): self.pc=a; c=16
-        elif op==0xCB: c=self._cb()
-        elif op==0xCC: # CALL Z
-            a=self._fetch16(); c=12
-            if self._zf(): self._call(a); c=24
-        elif op==0xCD: self._call(self._fetch16()); c=24
-        elif op==0xCE: self._add(self._fetch(),int(self._cf())); c=8
-        elif op==0xCF: self._call(0x08); c=16
-        elif op==0xD0: # RET NC
-            c=8
-            if not self._cf(): self._ret(); c=20
-        elif op==0xD1: self._set_de(self._pop()); c=12
-        elif op==0xD2: # JP NC
-            a=self._fetch16(); c=12
-            if not self._cf(): self.pc=a; c=16
-        elif op==0xD4: # CALL NC
-            a=self._fetch16(); c=12
-            if not self._cf(): self._call(a); c=24
-        elif op==0xD5: self._push(self._de()); c=16
-        elif op==0xD6: self._sub(self._fetch()); c=8
-        elif op==0xD7: self._call(0x10); c=16
-        elif op==0xD8: # RET C
-            c=8
-            if self._cf(): self._ret(); c=20
-        elif op==0xD9: self._ret(); self.ime=True; c=16  # RETI
-        elif op==0xDA: # JP C
-            a=self._fetch16(); c=12
-            if self._cf(): self.pc=a; c=16
-        elif op==0xDC: # CALL C
-            a=self._fetch16(); c=12
-            if self._cf(): self._call(a); c=24
-        elif op==0xDE: self._sub(self._fetch(),int(self._cf())); c=8
-        elif op==0xDF: self._call(0x18); c=16
-        elif op==0xE0: self.mmu.wb(0xFF00|self._fetch(),self.a); c=12
-        elif op==0xE1: self._set_hl(self._pop()); c=12
-        elif op==0xE2: self.mmu.wb(0xFF00|self.c,self.a); c=8
-        elif op==0xE5: self._push(self._hl()); c=16
-        elif op==0xE6: self._and(self._fetch()); c=8
-        elif op==0xE7: self._call(0x20); c=16
-        elif op==0xE8: # ADD SP,r8
-            v=self._fetch(); self.sp=self._sp_add(v); c=16
-        elif op==0xE9: self.pc=self._hl(); c=4
-        elif op==0xEA: self.mmu.wb(self._fetch16(),self.a); c=16
-        elif op==0xEE: self._xor(self._fetch()); c=8
-        elif op==0xEF: self._call(0x28); c=16
-        elif op==0xF0: self.a=self.mmu.rb(0xFF00|self._fetch()); c=12
-        elif op==0xF1: self._set_af(self._pop()); c=12
-        elif op==0xF2: self.a=self.mmu.rb(0xFF00|self.c); c=8
-        elif op==0xF3: self.ime=False; self._ime_pending=0
-        elif op==0xF5: self._push(self._af()); c=16
-        elif op==0xF6: self._or(self._fetch()); c=8
-        elif op==0xF7: self._call(0x30); c=16
-        elif op==0xF8: # LD HL,SP+r8
-            v=self._fetch(); self._set_hl(self._sp_add(v)); c=12
-        elif op==0xF9: self.sp=self._hl(); c=8
-        elif op==0xFA: self.a=self.mmu.rb(self._fetch16()); c=16
-        elif op==0xFB: self._ime_pending=2; c=4  # EI
-        elif op==0xFE: self._cp(self._fetch()); c=8
-        elif op==0xFF: self._call(0x38); c=16
-
-        self.cycles+=c
-
+        op=self._fetch()
+        self._OP_TABLE[op](self)
+        self.cycles+=self._CYCLES[op]
+
+    # ─ Main opcode table ───────────────────────────────────────
+    # Each handler is registered with its base cycle count; taken
+    # branches add their extra cycles themselves.
+    _OP_TABLE = _OP_TABLE
+    _CYCLES   = _CYCLES
+
+    @_op(0x00)
+    def _op_00(self): pass  # NOP
+    @_op(0x01,12)
+    def _op_01(self): self._set_bc(self._fetch16())
+    @_op(0x02,8)
+    def _op_02(self): self._wb(self._bc(),self.reg[A])
+    @_op(0x03,8)
+    def _op_03(self): self._set_bc((self._bc()+1)&0xFFFF)
+    @_op(0x04)
+    def _op_04(self): self.reg[B]=self._inc8(self.reg[B])
+    @_op(0x05)
+    def _op_05(self): self.reg[B]=self._dec8(self.reg[B])
+    @_op(0x06,8)
+    def _op_06(self): self.reg[B]=self._fetch()
+    @_op(0x07)
+    def _op_07(self): # RLCA
+        c2=self.reg[A]>>7; self.reg[A]=((self.reg[A]<<1)|c2)&0xFF; self._fz=0; self._fn=0; self._fh=0; self._fc=bool(c2)
+    @_op(0x08,20)
+    def _op_08(self): # LD (nn),SP
+        a=self._fetch16(); self._ww(a,self.sp)
+    @_op(0x09,8)
+    def _op_09(self): self._add_hl(self._bc())
+    @_op(0x0A,8)
+    def _op_0a(self): self.reg[A]=self._rb(self._bc())
+    @_op(0x0B,8)
+    def _op_0b(self): self._set_bc((self._bc()-1)&0xFFFF)
+    @_op(0x0C)
+    def _op_0c(self): self.reg[C]=self._inc8(self.reg[C])
+    @_op(0x0D)
+    def _op_0d(self): self.reg[C]=self._dec8(self.reg[C])
+    @_op(0x0E,8)
+    def _op_0e(self): self.reg[C]=self._fetch()
+    @_op(0x0F)
+    def _op_0f(self): # RRCA
+        c2=self.reg[A]&1; self.reg[A]=((self.reg[A]>>1)|(c2<<7))&0xFF; self._fz=0; self._fn=0; self._fh=0; self._fc=bool(c2)
+    @_op(0x10)
+    def _op_10(self): self._fetch()  # STOP
+    @_op(0x11,12)
+    def _op_11(self): self._set_de(self._fetch16())
+    @_op(0x12,8)
+    def _op_12(self): self._wb(self._de(),self.reg[A])
+    @_op(0x13,8)
+    def _op_13(self): self._set_de((self._de()+1)&0xFFFF)
+    @_op(0x14)
+    def _op_14(self): self.reg[D]=self._inc8(self.reg[D])
+    @_op(0x15)
+    def _op_15(self): self.reg[D]=self._dec8(self.reg[D])
+    @_op(0x16,8)
+    def _op_16(self): self.reg[D]=self._fetch()
+    @_op(0x17)
+    def _op_17(self): # RLA
+        c2=self._fc; nc=self.reg[A]>>7; self.reg[A]=((self.reg[A]<<1)|(1 if c2 else 0))&0xFF; self._fz=0; self._fn=0; self._fh=0; self._fc=bool(nc)
+    @_op(0x18,12)
+    def _op_18(self): self._jr(self._fetch())
+    @_op(0x19,8)
+    def _op_19(self): self._add_hl(self._de())
+    @_op(0x1A,8)
+    def _op_1a(self): self.reg[A]=self._rb(self._de())
+    @_op(0x1B,8)
+    def _op_1b(self): self._set_de((self._de()-1)&0xFFFF)
+    @_op(0x1C)
+    def _op_1c(self): self.reg[E]=self._inc8(self.reg[E])
+    @_op(0x1D)
+    def _op_1d(self): self.reg[E]=self._dec8(self.reg[E])
+    @_op(0x1E,8)
+    def _op_1e(self): self.reg[E]=self._fetch()
+    @_op(0x1F)
+    def _op_1f(self): # RRA
+        c2=self.reg[A]&1; nc=self._fc; self.reg[A]=((self.reg[A]>>1)|(0x80 if nc else 0))&0xFF; self._fz=0; self._fn=0; self._fh=0; self._fc=bool(c2)
+    @_op(0x20,8)
+    def _op_20(self): # JR NZ
+        d=self._fetch()
+        if not self._fz: self._jr(d); self.cycles+=4
+    @_op(0x21,12)
+    def _op_21(self): self._set_hl(self._fetch16())
+    @_op(0x22,8)
+    def _op_22(self): self._wb(self._hl(),self.reg[A]); self._set_hl((self._hl()+1)&0xFFFF)
+    @_op(0x23,8)
+    def _op_23(self): self._set_hl((self._hl()+1)&0xFFFF)
+    @_op(0x24)
+    def _op_24(self): self.reg[H]=self._inc8(self.reg[H])
+    @_op(0x25)
+    def _op_25(self): self.reg[H]=self._dec8(self.reg[H])
+    @_op(0x26,8)
+    def _op_26(self): self.reg[H]=self._fetch()
+    @_op(0x27)
+    def _op_27(self): # DAA
+        a=self.reg[A]
+        if not self._fn:
+            if self._fh or (a&0xF)>9: a+=6
+            if self._fc or a>0x99: a+=0x60; self._fc=1
+        else:
+            if self._fh: a-=6
+            if self._fc: a-=0x60
+        a&=0xFF; self.reg[A]=a; self._fz=a==0; self._fh=0
+    @_op(0x28,8)
+    def _op_28(self): # JR Z
+        d=self._fetch()
+        if self._fz: self._jr(d); self.cycles+=4
+    @_op(0x29,8)
+    def _op_29(self): self._add_hl(self._hl())
+    @_op(0x2A,8)
+    def _op_2a(self): self.reg[A]=self._rb(self._hl()); self._set_hl((self._hl()+1)&0xFFFF)
+    @_op(0x2B,8)
+    def _op_2b(self): self._set_hl((self._hl()-1)&0xFFFF)
+    @_op(0x2C)
+    def _op_2c(self): self.reg[L]=self._inc8(self.reg[L])
+    @_op(0x2D)
+    def _op_2d(self): self.reg[L]=self._dec8(self.reg[L])
+    @_op(0x2E,8)
+    def _op_2e(self): self.reg[L]=self._fetch()
+    @_op(0x2F)
+    def _op_2f(self): self.reg[A]^=0xFF; self._fn=self._fh=1  # CPL
+    @_op(0x30,8)
+    def _op_30(self): # JR NC
+        d=self._fetch()
+        if not self._fc: self._jr(d); self.cycles+=4
+    @_op(0x31,12)
+    def _op_31(self): self.sp=self._fetch16()
+    @_op(0x32,8)
+    def _op_32(self): self._wb(self._hl(),self.reg[A]); self._set_hl((self._hl()-1)&0xFFFF)
+    @_op(0x33,8)
+    def _op_33(self): self.sp=(self.sp+1)&0xFFFF
+    @_op(0x34,12)
+    def _op_34(self): hl=self._hl(); self._wb(hl,self._inc8(self._rb(hl)))
+    @_op(0x35,12)
+    def _op_35(self): hl=self._hl(); self._wb(hl,self._dec8(self._rb(hl)))
+    @_op(0x36,12)
+    def _op_36(self): self._wb(self._hl(),self._fetch())
+    @_op(0x37)
+    def _op_37(self): self._fn=0; self._fh=0; self._fc=1  # SCF
+    @_op(0x38,8)
+    def _op_38(self): # JR C
+        d=self._fetch()
+        if self._fc: self._jr(d); self.cycles+=4
+    @_op(0x39,8)
+    def _op_39(self): self._add_hl(self.sp)
+    @_op(0x3A,8)
+    def _op_3a(self): self.reg[A]=self._rb(self._hl()); self._set_hl((self._hl()-1)&0xFFFF)
+    @_op(0x3B,8)
+    def _op_3b(self): self.sp=(self.sp-1)&0xFFFF
+    @_op(0x3C)
+    def _op_3c(self): self.reg[A]=self._inc8(self.reg[A])
+    @_op(0x3D)
+    def _op_3d(self): self.reg[A]=self._dec8(self.reg[A])
+    @_op(0x3E,8)
+    def _op_3e(self): self.reg[A]=self._fetch()
+    @_op(0x3F)
+    def _op_3f(self): self._fn=0; self._fh=0; self._fc=not self._fc  # CCF
+
+    # 0x40-0x7F  LD r,r
+    for _o in range(0x40,0x80):
+        _op(_o, 8 if (_o&7)==6 or (_o>>3)&7==6 else 4)(_ld_r_r((_o>>3)&7, _o&7))
+    # 0x80-0xBF  ALU A,r
+    _alu = (_add,_adc,_sub,_sbc,_and,_xor,_or,_cp)
+    for _o in range(0x80,0xC0):
+        _op(_o, 8 if (_o&7)==6 else 4)(_alu_r(_alu[(_o>>3)&7], _o&7))
+    del _o, _alu
+
+    @_op(0x76)
+    def _op_76(self): self.halted=True  # HALT
+    @_op(0xC0,8)
+    def _op_c0(self): # RET NZ
+        if not self._fz: self._ret(); self.cycles+=12
+    @_op(0xC1,12)
+    def _op_c1(self): self._set_bc(self._pop())
+    @_op(0xC2,12)
+    def _op_c2(self): # JP NZ
+        a=self._fetch16()
+        if not self._fz: self.pc=a; self.cycles+=4
+    @_op(0xC3,16)
+    def _op_c3(self): self.pc=self._fetch16()
+    @_op(0xC4,12)
+    def _op_c4(self): # CALL NZ
+        a=self._fetch16()
+        if not self._fz: self._call(a); self.cycles+=12
+    @_op(0xC5,16)
+    def _op_c5(self): self._push(self._bc())
+    @_op(0xC6,8)
+    def _op_c6(self): self._add(self._fetch())
+    @_op(0xC7,16)
+    def _op_c7(self): self._call(0x00)
+    @_op(0xC8,8)
+    def _op_c8(self): # RET Z
+        if self._fz: self._ret(); self.cycles+=12
+    @_op(0xC9,16)
+    def _op_c9(self): self._ret()
+    @_op(0xCA,12)
+    def _op_ca(self): # JP Z
+        a=self._fetch16()
+        if self._fz: self.pc=a; self.cycles+=4
+    @_op(0xCB,0)
+    def _op_cb(self): self.cycles+=self._cb()
+    @_op(0xCC,12)
+    def _op_cc(self): # CALL Z
+        a=self._fetch16()
+        if self._fz: self._call(a); self.cycles+=12
+    @_op(0xCD,24)
+    def _op_cd(self): self._call(self._fetch16())
+    @_op(0xCE,8)
+    def _op_ce(self): self._add(self._fetch(),self._fc)
+    @_op(0xCF,16)
+    def _op_cf(self): self._call(0x08)
+    @_op(0xD0,8)
+    def _op_d0(self): # RET NC
+        if not self._fc: self._ret(); self.cycles+=12
+    @_op(0xD1,12)
+    def _op_d1(self): self._set_de(self._pop())
+    @_op(0xD2,12)
+    def _op_d2(self): # JP NC
+        a=self._fetch16()
+        if not self._fc: self.pc=a; self.cycles+=4
+    @_op(0xD4,12)
+    def _op_d4(self): # CALL NC
+        a=self._fetch16()
+        if not self._fc: self._call(a); self.cycles+=12
+    @_op(0xD5,16)
+    def _op_d5(self): self._push(self._de())
+    @_op(0xD6,8)
+    def _op_d6(self): self._sub(self._fetch())
+    @_op(0xD7,16)
+    def _op_d7(self): self._call(0x10)
+    @_op(0xD8,8)
+    def _op_d8(self): # RET C
+        if self._fc: self._ret(); self.cycles+=12
+    @_op(0xD9,16)
+    def _op_d9(self): self._ret(); self.ime=True  # RETI
+    @_op(0xDA,12)
+    def _op_da(self): # JP C
+        a=self._fetch16()
+        if self._fc: self.pc=a; self.cycles+=4
+    @_op(0xDC,12)
+    def _op_dc(self): # CALL C
+        a=self._fetch16()
+        if self._fc: self._call(a); self.cycles+=12
+    @_op(0xDE,8)
+    def _op_de(self): self._sub(self._fetch(),self._fc)
+    @_op(0xDF,16)
+    def _op_df(self): self._call(0x18)
+    @_op(0xE0,12)
+    def _op_e0(self): self._wb(0xFF00|self._fetch(),self.reg[A])
+    @_op(0xE1,12)
+    def _op_e1(self): self._set_hl(self._pop())
+    @_op(0xE2,8)
+    def _op_e2(self): self._wb(0xFF00|self.reg[C],self.reg[A])
+    @_op(0xE5,16)
+    def _op_e5(self): self._push(self._hl())
+    @_op(0xE6,8)
+    def _op_e6(self): self._and(self._fetch())
+    @_op(0xE7,16)
+    def _op_e7(self): self._call(0x20)
+    @_op(0xE8,16)
+    def _op_e8(self): # ADD SP,r8
+        v=self._fetch(); self.sp=self._sp_add(v)
+    @_op(0xE9)
+    def _op_e9(self): self.pc=self._hl()
+    @_op(0xEA,16)
+    def _op_ea(self): self._wb(self._fetch16(),self.reg[A])
+    @_op(0xEE,8)
+    def _op_ee(self): self._xor(self._fetch())
+    @_op(0xEF,16)
+    def _op_ef(self): self._call(0x28)
+    @_op(0xF0,12)
+    def _op_f0(self): self.reg[A]=self._rb(0xFF00|self._fetch())
+    @_op(0xF1,12)
+    def _op_f1(self): self._set_af(self._pop())
+    @_op(0xF2,8)
+    def _op_f2(self): self.reg[A]=self._rb(0xFF00|self.reg[C])
+    @_op(0xF3)
+    def _op_f3(self): self.ime=False; self._ime_pending=0  # DI
+    @_op(0xF5,16)
+    def _op_f5(self): self._push(self._af())
+    @_op(0xF6,8)
+    def _op_f6(self): self._or(self._fetch())
+    @_op(0xF7,16)
+    def _op_f7(self): self._call(0x30)
+    @_op(0xF8,12)
+    def _op_f8(self): # LD HL,SP+r8
+        v=self._fetch(); self._set_hl(self._sp_add(v))
+    @_op(0xF9,8)
+    def _op_f9(self): self.sp=self._hl()
+    @_op(0xFA,16)
+    def _op_fa(self): self.reg[A]=self._rb(self._fetch16())
+    @_op(0xFB)
+    def _op_fb(self): self._ime_pending=2  # EI
+    @_op(0xFE,8)
+    def _op_fe(self): self._cp(self._fetch())
+    @_op(0xFF,16)
+    def _op_ff(self): self._call(0x38)
+
+    # ─ CB-prefixed table ───────────────────────────────────────
     def _cb(self):
-        op=self._fetch(); reg=op&7; bit=(op>>3)&7; grp=op>>6
-        v=self._r8(reg); c=8+(4 if reg==6 else 0)
-        if grp==0:
-            if   bit==0: v=self._rl(v,True)  # RLC
-            elif bit==1: v=self._rr(v,True)  # RRC  (thru=False for rotate)
-            elif bit==2: v=self._rl(v,True)  # RL
-            elif bit==3: v=self._rr(v,True)  # RR
-            elif bit==4: v=self._sla(v)
-            elif bit==5: v=self._sra(v)
-            elif bit==6: v=self._swap(v)
-            elif bit==7: v=self._srl(v)
-            # fix rotate-not-thru
-            if bit==0:
-                c2=(v>>7)&1 # already shifted... redo properly
-                orig=self._r8(reg) if False else v  # v is already shifted above
-            self._w8(reg,v)
-        elif grp==1: self._bit(bit,v); c=8+(4 if reg==6 else 0)
-        elif grp==2: self._w8(reg,self._res_b(bit,v)); c=8+(4 if reg==6 else 0)
-        elif grp==3: self._w8(reg,self._set_b(bit,v)); c=8+(4 if reg==6 else 0)
-        return c+4  # +4 for CB prefix fetch
-
-    def _cb_fixed(self):
-        """Proper CB rotation handlers"""
-        pass
+        op=self._fetch(); _CB_TABLE[op](self); return _CB_CYCLES[op]
+
+    # 0x00-0x3F  RLC RRC RL RR SLA SRA SWAP SRL, then BIT/RES/SET 0x40-0xFF
+    _shift = (_rlc,_rrc,_rl,_rr,_sla,_sra,_swap,_srl)
+    for _o in range(256):
+        _CB_TABLE[_o]=_cb_op(_o>>6,(_o>>3)&7,_o&7,_shift[(_o>>3)&7])
+    del _o, _shift
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  BLOCK RECOMPILER
+# ══════════════════════════════════════════════════════════════════════
+# Straight-line runs of ROM code are translated once into Python source
+# (one function per block, keyed by bank and address) and exec'd, so the
+# fetch/decode/dispatch of every opcode disappears.
+#
+# A block only contains instructions whose effect cannot be seen by the
+# PPU, timer or interrupt logic before the block ends: register ops, and
+# loads/stores whose address turns out (at run time) to be WRAM or VRAM.
+# Any other address takes a side exit with PC on that instruction, so the
+# interpreter runs it. JR/JP may end a block; CALL/RET/RST, stack ops,
+# EI/DI/HALT/STOP and (HL) CB ops are left to the interpreter.
+# GameBoy.run_frame only enters a block when the PPU and timer cannot
+# change state within its worst-case cycle count, which keeps the result
+# identical to stepping the interpreter.
+
+_RD_PAGE = bytes(1 if 0x80<=p<0xA0 or 0xC0<=p<0xE0 else 0 for p in range(256))
+_WR_PAGE = bytes(2 if 0x80<=p<0xA0 else 1 if 0xC0<=p<0xE0 else 0 for p in range(256))
+_RN = ('reg[2]','reg[3]','reg[4]','reg[5]','reg[6]','reg[7]',None,'reg[0]')
+_ALU_SRC = (
+    "reg[0],cpu._fz,cpu._fh,cpu._fc=ADD[(reg[0]<<8)|{v}]; cpu._fn=0",
+    "reg[0],cpu._fz,cpu._fh,cpu._fc=ADD[(cpu._fc<<16)|(reg[0]<<8)|{v}]; cpu._fn=0",
+    "reg[0],cpu._fz,cpu._fh,cpu._fc=SUB[(reg[0]<<8)|{v}]; cpu._fn=1",
+    "reg[0],cpu._fz,cpu._fh,cpu._fc=SUB[(cpu._fc<<16)|(reg[0]<<8)|{v}]; cpu._fn=1",
+    "a=reg[0]&{v}; reg[0]=a; cpu._fz=a==0; cpu._fn=0; cpu._fh=1; cpu._fc=0",
+    "a=reg[0]^{v}; reg[0]=a; cpu._fz=a==0; cpu._fn=0; cpu._fh=0; cpu._fc=0",
+    "a=reg[0]|{v}; reg[0]=a; cpu._fz=a==0; cpu._fn=0; cpu._fh=0; cpu._fc=0",
+    "_,cpu._fz,cpu._fh,cpu._fc=SUB[(reg[0]<<8)|{v}]; cpu._fn=1",
+)
+# register-only opcodes run through their normal handler (PC set first)
+_SAFE_OPS = frozenset((0x00,0x01,0x11,0x21,0x31,0x03,0x13,0x23,0x33,
+    0x0B,0x1B,0x2B,0x3B,0x09,0x19,0x29,0x39,0x07,0x0F,0x17,0x1F,
+    0x27,0x2F,0x37,0x3F,0xE8,0xF8,0xF9))
+_JR_CC = {0x20:'not cpu._fz',0x28:'cpu._fz',0x30:'not cpu._fc',0x38:'cpu._fc'}
+_JP_CC = {0xC2:'not cpu._fz',0xCA:'cpu._fz',0xD2:'not cpu._fc',0xDA:'cpu._fc'}
+_OP_LEN = [1]*256
+for _o in (0x06,0x0E,0x16,0x1E,0x26,0x2E,0x36,0x3E,0x18,0x20,0x28,0x30,0x38,
+           0xC6,0xCE,0xD6,0xDE,0xE6,0xEE,0xF6,0xFE,0xE0,0xF0,0xE8,0xF8,0xCB):
+    _OP_LEN[_o]=2
+for _o in (0x01,0x11,0x21,0x31,0x08,0xC2,0xC3,0xC4,0xCA,0xCC,0xCD,
+           0xD2,0xD4,0xDA,0xDC,0xEA,0xFA):
+    _OP_LEN[_o]=3
+del _o
+
+
+class Recompiler:
+    MAX_OPS = 24     # instructions per block
+    MAX_CYC = 64     # worst-case cycles per block
+
+    def __init__(self, cpu, ppu):
+        self.cpu=cpu; self.cart=cpu.cart
+        self.blocks={}
+        self.env={'ADD':_ADD_LUT,'SUB':_SUB_LUT,'INC':_INC_LUT,'DEC':_DEC_LUT,
+                  'RD':_RD_PAGE,'WR':_WR_PAGE,'ops':_OP_TABLE,'cb':_CB_TABLE,'ppu_write':ppu.write}
+
+    def lookup(self, pc):
+        # → compiled block for pc (None if not worth one); pc must be in ROM
+        key=pc if pc<0x4000 else (self.cart.rom1_bank<<16)|pc
+        try: return self.blocks[key]
+        except KeyError:
+            fn=self.blocks[key]=self._compile(pc)
+            return fn
+
+    def _compile(self, pc):
+        rom,base=(self.cart.rom0,0) if pc<0x4000 else (self.cart.rom1,0x4000)
+        end=base+0x4000; start=pc
+        out=[]; cyc=0; n=0; worst=0; closed=False; steps=[]
+        def ex(a, c): return f"cpu.pc={a:#06x}; return {c}"
+        def read(a_expr, dst, a, c):
+            out.append(f"a={a_expr}")
+            out.append(f"if not RD[a>>8]: {ex(a,c)}")
+            out.append(f"{dst}=mem[a]")
+        def write(a_expr, v_expr, a, c):
+            out.append(f"a={a_expr}; p=WR[a>>8]")
+            out.append(f"if p==1: mem[a]={v_expr}")
+            out.append(f"elif p==2: ppu_write(a,{v_expr})")
+            out.append(f"else: {ex(a,c)}")
+
+        while n<self.MAX_OPS and pc<end:
+            op=rom[pc-base]; ln=_OP_LEN[op]
+            if pc+ln>end: break
+            b1=rom[pc+1-base] if ln>1 else 0
+            b2=rom[pc+2-base] if ln>2 else 0
+            nxt=pc+ln; oc=_CYCLES[op]
+            hi=(op>>3)&7; lo=op&7
+            if op==0xCB: oc=12
+            if cyc+oc+4>self.MAX_CYC: break
+
+            if op==0x00: pass
+            elif op in _SAFE_OPS:
+                out.append(f"cpu.pc={pc+1:#06x}; ops[{op:#04x}](cpu)")
+            elif op==0xCB:
+                if b1&7==6: break
+                out.append(f"cb[{b1:#04x}](cpu)")
+            elif 0x40<=op<0x80 and op!=0x76:
+                if lo==6: read("(reg[6]<<8)|reg[7]",_RN[hi],pc,cyc)
+                elif hi==6: write("(reg[6]<<8)|reg[7]",_RN[lo],pc,cyc)
+                else: out.append(f"{_RN[hi]}={_RN[lo]}")
+            elif 0x80<=op<0xC0:
+                if lo==6: read("(reg[6]<<8)|reg[7]","v",pc,cyc); src="v"
+                else: src=_RN[lo]
+                out.append(_ALU_SRC[hi].format(v=src))
+            elif op&0xC7==0xC6: out.append(_ALU_SRC[hi].format(v=b1))
+            elif op&0xC7==0x06:
+                if hi==6: write("(reg[6]<<8)|reg[7]",str(b1),pc,cyc)
+                else: out.append(f"{_RN[hi]}={b1}")
+            elif op&0xC6==0x04:
+                t,fn=("INC",0) if lo==4 else ("DEC",1)
+                if hi==6:
+                    out.append(f"a=(reg[6]<<8)|reg[7]; p=WR[a>>8]")
+                    out.append(f"if not p: {ex(pc,cyc)}")
+                    out.append(f"r,cpu._fz,cpu._fh={t}[mem[a]]; cpu._fn={fn}")
+                    out.append(f"if p==1: mem[a]=r")
+                    out.append(f"else: ppu_write(a,r)")
+                else: out.append(f"{_RN[hi]},cpu._fz,cpu._fh={t}[{_RN[hi]}]; cpu._fn={fn}")
+            elif op in (0x02,0x12): write(("(reg[2]<<8)|reg[3]","(reg[4]<<8)|reg[5]")[op>>4],"reg[0]",pc,cyc)
+            elif op in (0x0A,0x1A): read(("(reg[2]<<8)|reg[3]","(reg[4]<<8)|reg[5]")[op>>4],"reg[0]",pc,cyc)
+            elif op in (0x22,0x32,0x2A,0x3A):
+                if op&8: read("(reg[6]<<8)|reg[7]","reg[0]",pc,cyc)
+                else: write("(reg[6]<<8)|reg[7]","reg[0]",pc,cyc)
+                out.append(f"a=(a{'+' if op<0x30 else '-'}1)&0xFFFF; reg[6]=a>>8; reg[7]=a&0xFF")
+            elif op in (0xE0,0xF0,0xEA,0xFA,0xE2,0xF2):
+                if op in (0xE2,0xF2):
+                    # (0xFF00+C) only stays in the block when it is HRAM
+                    out.append(f"c=reg[3]")
+                    out.append(f"if c<0x80 or c==0xFF: {ex(pc,cyc)}")
+                    out.append("mem[0xFF00|c]=reg[0]" if op==0xE2 else "reg[0]=mem[0xFF00|c]")
+                else:
+                    a=0xFF00|b1 if op in (0xE0,0xF0) else b1|(b2<<8)
+                    ram=0xFF80<=a<0xFFFF or _RD_PAGE[a>>8]
+                    if not ram: break
+                    if op in (0xF0,0xFA): out.append(f"reg[0]=mem[{a:#06x}]")
+                    elif _WR_PAGE[a>>8]==2: out.append(f"ppu_write({a:#06x},reg[0])")
+                    else: out.append(f"mem[{a:#06x}]=reg[0]")
+            elif op in (0x18,0xC3):
+                cyc+=oc; n+=1; worst=cyc; closed=True; steps.append(oc)
+                out.append(ex((nxt+((b1^0x80)-0x80))&0xFFFF if op==0x18 else b1|(b2<<8),cyc))
+                break
+            elif op in _JR_CC or op in _JP_CC:
+                cyc+=oc; n+=1; worst=cyc+4; closed=True; steps.append(oc)
+                if op in _JR_CC: tgt=(nxt+((b1^0x80)-0x80))&0xFFFF; cond=_JR_CC[op]
+                else: tgt=b1|(b2<<8); cond=_JP_CC[op]
+                out.append(f"if {cond}: {ex(tgt,cyc+4)}")
+                out.append(ex(nxt,cyc)); break
+            else: break
+            cyc+=oc; n+=1; pc=nxt; worst=cyc; steps.append(oc)
+        if n<2: return None
+        if not closed: out.append(ex(pc,cyc))
+        src="def block(cpu, reg, mem):\n"+"".join(f"    {l}\n" for l in out)
+        ns=dict(self.env); exec(compile(src,f"<block {start:04x}>","exec"),ns)
+        fn=ns['block']; fn.max_cyc=worst; fn.n_ops=n
+        # returned cycle count → per-instruction cycles of the part that ran,
+        # so the caller can replay the timer exactly as the interpreter would
+        fn.seq={sum(steps[:k]):tuple(steps[:k]) for k in range(n+1)}
+        if worst>cyc: fn.seq[worst]=tuple(steps[:-1])+(steps[-1]+4,)
+        return fn
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  CPU BURST KERNEL  (Numba, optional)
+# ══════════════════════════════════════════════════════════════════════
+# The interpreter loop itself, compiled: runs SM83 code straight out of
+# the flat memory map and the whole ROM image until the cycle budget is
+# spent, then hands back to run_slice. Whatever needs the Python side —
+# IO writes, most IO reads, cart RAM, HALT, EI/DI/RETI, unused opcodes —
+# stops the burst with PC on that instruction, so CPU.step runs it.
+# run_slice picks the budget so the PPU cannot change mode and no
+# interrupt can become due inside a burst; the timer is stepped here per
+# instruction exactly as Timer.step would, and a TIMA overflow ends it.
+#
+# st (int64) holds the CPU state going in and out:
+#   0-7 A F B C D E H L, then the _S_* slots below
+_S_PC,_S_SP,_S_FZ,_S_FN,_S_FH,_S_FC = range(8,14)
+_S_DIV,_S_TIMA,_S_TBIT,_S_BANK = range(14,18)      # TBIT -1: TIMA stopped
+_S_IF,_S_IE,_S_LCDC,_S_STAT,_S_LY = range(18,23)   # read-only IO snapshot
+_S_EXIT = 23                                       # see _X_*
+_ST_LEN = 24
+_X_BUDGET,_X_OP,_X_TIMA = 0,1,2                    # why a burst ended
+
+if numba:
+    _BURST_R8 = np.array(_R8[:6]+(0,A),np.int64)    # (HL) is never looked up
+    _BURST_LEN = np.array(_OP_LEN,np.int64); _BURST_LEN[0x10]=2   # STOP eats a byte
+    _BURST_CYC = np.array(_CYCLES,np.int64)
+    _BURST_CB = np.array(_CB_CYCLES,np.int64)
+    # worst case per opcode (taken branch, CB (HL)); 0 = leave it to Python
+    _BURST_MAX = _BURST_CYC.copy()
+    for _o in (0x20,0x28,0x30,0x38,0xC2,0xCA,0xD2,0xDA): _BURST_MAX[_o]+=4
+    for _o in (0xC0,0xC8,0xD0,0xD8,0xC4,0xCC,0xD4,0xDC): _BURST_MAX[_o]+=12
+    _BURST_MAX[0xCB]=16
+    for _o in (0x76,0xD9,0xF3,0xFB,0xD3,0xDB,0xDD,0xE3,0xE4,0xEB,0xEC,0xED,0xF4,0xFC,0xFD):
+        _BURST_MAX[_o]=0
+    del _o
+
+    @numba.njit(cache=True, boundscheck=False)
+    def _burst_rd(st, mem, rom, a):
+        # → byte at a, or -1 where only the MMU knows the answer
+        if a<0x4000: return int(rom[a])
+        if a<0x8000: return int(rom[st[_S_BANK]+a-0x4000])
+        if a<0xA000 or 0xC000<=a<0xE000 or 0xFE00<=a<0xFEA0 or 0xFF80<=a<0xFFFF: return int(mem[a])
+        if 0xE000<=a<0xFE00: return int(mem[a-0x2000])
+        if a==0xFF04: return (st[_S_DIV]>>8)&0xFF
+        if a==0xFF05: return st[_S_TIMA]
+        if a==0xFF0F: return st[_S_IF]|0xE0
+        if a==0xFF40: return st[_S_LCDC]
+        if a==0xFF41: return (st[_S_STAT]|0x80)&0xFF
+        if a==0xFF44: return st[_S_LY]
+        if a==0xFFFF: return st[_S_IE]
+        return -1
+
+    @numba.njit(cache=True, boundscheck=False)
+    def _burst_wok(a):
+        # plain RAM only: VRAM, WRAM + echo, OAM, HRAM
+        return 0x8000<=a<0xA000 or 0xC000<=a<0xFEA0 or 0xFF80<=a<0xFFFF
+
+    @numba.njit(cache=True, boundscheck=False)
+    def _burst_wr(mem, dirty, a, v):
+        if 0xE000<=a<0xFE00: a-=0x2000
+        mem[a]=v
+        if 0x8000<=a<0x9800: dirty[(a-0x8000)>>4]=1
+
+    @numba.njit(cache=True, boundscheck=False)
+    def _cpu_burst(st, mem, rom, dirty, budget):
+        # → machine cycles run; st is updated in place
+        pc=st[_S_PC]; sp=st[_S_SP]
+        fz=st[_S_FZ]; fn=st[_S_FN]; fh=st[_S_FH]; fc=st[_S_FC]
+        tbit=st[_S_TBIT]; cyc=0; why=_X_BUDGET
+        while True:
+            op=_burst_rd(st,mem,rom,pc)
+            mc=_BURST_MAX[op] if op>=0 else 0
+            if mc==0: why=_X_OP; break
+            if cyc+mc>budget: break
+            ln=_BURST_LEN[op]
+            b1=_burst_rd(st,mem,rom,(pc+1)&0xFFFF) if ln>1 else 0
+            b2=_burst_rd(st,mem,rom,(pc+2)&0xFFFF) if ln>2 else 0
+            if b1<0 or b2<0: why=_X_OP; break
+            npc=(pc+ln)&0xFFFF; k=_BURST_CYC[op]
+            hi=(op>>3)&7; lo=op&7
+            hl=(st[H]<<8)|st[L]
+
+            if 0x40<=op<0x80:                       # LD r,r'
+                if lo==6:
+                    v=_burst_rd(st,mem,rom,hl)
+                    if v<0: why=_X_OP; break
+                else: v=st[_BURST_R8[lo]]
+                if hi==6:
+                    if not _burst_wok(hl): why=_X_OP; break
+                    _burst_wr(mem,dirty,hl,v)
+                else: st[_BURST_R8[hi]]=v
+            elif 0x80<=op<0xC0 or op&0xC7==0xC6:    # ALU A,r / A,d8
+                if op>=0xC0: v=b1
+                elif lo==6:
+                    v=_burst_rd(st,mem,rom,hl)
+                    if v<0: why=_X_OP; break
+                else: v=st[_BURST_R8[lo]]
+                a=st[A]
+                if hi<2:
+                    c=fc if hi==1 else 0; r=a+v+c
+                    fh=int((a&0xF)+(v&0xF)+c>0xF); fc=int(r>0xFF); fn=0
+                elif hi<4 or hi==7:
+                    c=fc if hi==3 else 0; r=a-v-c
+                    fh=int((a&0xF)-(v&0xF)-c<0); fc=int(r<0); fn=1
+                else:
+                    r=a&v if hi==4 else a^v if hi==5 else a|v
+                    fh=int(hi==4); fc=0; fn=0
+                r&=0xFF; fz=int(r==0)
+                if hi!=7: st[A]=r
+            elif op&0xC6==0x04:                     # INC/DEC r
+                if hi==6:
+                    v=_burst_rd(st,mem,rom,hl)
+                    if v<0 or not _burst_wok(hl): why=_X_OP; break
+                else: v=st[_BURST_R8[hi]]
+                if lo==4: r=(v+1)&0xFF; fh=int(v&0xF==0xF); fn=0
+                else: r=(v-1)&0xFF; fh=int(v&0xF==0); fn=1
+                fz=int(r==0)
+                if hi==6: _burst_wr(mem,dirty,hl,r)
+                else: st[_BURST_R8[hi]]=r
+            elif op&0xC7==0x06:                     # LD r,d8
+                if hi==6:
+                    if not _burst_wok(hl): why=_X_OP; break
+                    _burst_wr(mem,dirty,hl,b1)
+                else: st[_BURST_R8[hi]]=b1
+            elif op<0x40 and op&0xF==0x01:          # LD rr,d16
+                if op==0x31: sp=b1|(b2<<8)
+                else: i=2+((op>>4)<<1); st[i]=b2; st[i+1]=b1
+            elif op<0x40 and op&0x7==0x3:           # INC/DEC rr
+                d=1 if op&8==0 else -1
+                if op>=0x30: sp=(sp+d)&0xFFFF
+                else:
+                    i=2+((op>>4)<<1); v=(((st[i]<<8)|st[i+1])+d)&0xFFFF
+                    st[i]=v>>8; st[i+1]=v&0xFF
+            elif op<0x40 and op&0xF==0x9:           # ADD HL,rr
+                if op==0x39: v=sp
+                else: i=2+((op>>4)<<1); v=(st[i]<<8)|st[i+1]
+                r=hl+v; fn=0; fh=int((hl&0xFFF)+(v&0xFFF)>0xFFF); fc=int(r>0xFFFF)
+                st[H]=(r>>8)&0xFF; st[L]=r&0xFF
+            elif op<0x40 and op&0x7==0x2:           # LD (rr),A / LD A,(rr)
+                if op<0x20: i=2+((op>>4)<<1); a=(st[i]<<8)|st[i+1]
+                else: a=hl
+                if op&8:
+                    v=_burst_rd(st,mem,rom,a)
+                    if v<0: why=_X_OP; break
+                    st[A]=v
+                else:
+                    if not _burst_wok(a): why=_X_OP; break
+                    _burst_wr(mem,dirty,a,st[A])
+                if op>=0x20:
+                    a=(a+(1 if op<0x30 else -1))&0xFFFF; st[H]=a>>8; st[L]=a&0xFF
+            elif op<0x40 and op&0x7==0x7:           # RLCA RRCA RLA RRA DAA CPL SCF CCF
+                a=st[A]
+                if op==0x07: fc=a>>7; a=((a<<1)|fc)&0xFF; fz=0; fn=0; fh=0
+                elif op==0x0F: fc=a&1; a=(a>>1)|(fc<<7); fz=0; fn=0; fh=0
+                elif op==0x17: c=a>>7; a=((a<<1)|fc)&0xFF; fc=c; fz=0; fn=0; fh=0
+                elif op==0x1F: c=a&1; a=(a>>1)|(fc<<7); fc=c; fz=0; fn=0; fh=0
+                elif op==0x27:
+                    if not fn:
+                        if fh or (a&0xF)>9: a+=6
+                        if fc or a>0x99: a+=0x60; fc=1
+                    else:
+                        if fh: a-=6
+                        if fc: a-=0x60
+                    a&=0xFF; fz=int(a==0); fh=0
+                elif op==0x2F: a^=0xFF; fn=1; fh=1
+                elif op==0x37: fn=0; fh=0; fc=1
+                else: fn=0; fh=0; fc=1-fc
+                st[A]=a
+            elif op==0x08:                          # LD (a16),SP
+                a=b1|(b2<<8)
+                if not (_burst_wok(a) and _burst_wok((a+1)&0xFFFF)): why=_X_OP; break
+                _burst_wr(mem,dirty,a,sp&0xFF); _burst_wr(mem,dirty,(a+1)&0xFFFF,sp>>8)
+            elif op==0x00 or op==0x10: pass        # NOP, STOP
+            elif op==0x18: npc=(npc+((b1^0x80)-0x80))&0xFFFF
+            elif op&0xE7==0x20:                     # JR cc
+                if (fz if hi<6 else fc)==(hi&1): npc=(npc+((b1^0x80)-0x80))&0xFFFF; k+=4
+            elif op&0xE7==0xC0 or op==0xC9:         # RET cc / RET
+                if op==0xC9 or (fz if hi<2 else fc)==(hi&1):
+                    v=_burst_rd(st,mem,rom,sp); v2=_burst_rd(st,mem,rom,(sp+1)&0xFFFF)
+                    if v<0 or v2<0: why=_X_OP; break
+                    npc=v|(v2<<8); sp=(sp+2)&0xFFFF
+                    if op!=0xC9: k+=12
+            elif op&0xE7==0xC2 or op==0xC3:         # JP cc / JP
+                if op==0xC3 or (fz if hi<2 else fc)==(hi&1):
+                    npc=b1|(b2<<8)
+                    if op!=0xC3: k+=4
+            elif op&0xE7==0xC4 or op==0xCD or op&0xC7==0xC7:   # CALL cc / CALL / RST
+                if op&0xC7==0xC7 or op==0xCD or (fz if hi<2 else fc)==(hi&1):
+                    a=(sp-1)&0xFFFF; a2=(sp-2)&0xFFFF
+                    if not (_burst_wok(a) and _burst_wok(a2)): why=_X_OP; break
+                    _burst_wr(mem,dirty,a2,npc&0xFF); _burst_wr(mem,dirty,a,npc>>8); sp=a2
+                    npc=op&0x38 if op&0xC7==0xC7 else b1|(b2<<8)
+                    if op&0xC7==0xC4: k+=12
+            elif op&0xCF==0xC1:                     # POP rr
+                v=_burst_rd(st,mem,rom,sp); v2=_burst_rd(st,mem,rom,(sp+1)&0xFFFF)
+                if v<0 or v2<0: why=_X_OP; break
+                sp=(sp+2)&0xFFFF
+                if op==0xF1:
+                    st[A]=v2; fz=(v>>7)&1; fn=(v>>6)&1; fh=(v>>5)&1; fc=(v>>4)&1
+                else: i=2+(((op>>4)&3)<<1); st[i]=v2; st[i+1]=v
+            elif op&0xCF==0xC5:                     # PUSH rr
+                a=(sp-1)&0xFFFF; a2=(sp-2)&0xFFFF
+                if not (_burst_wok(a) and _burst_wok(a2)): why=_X_OP; break
+                if op==0xF5: v2=st[A]; v=(fz<<7)|(fn<<6)|(fh<<5)|(fc<<4)
+                else: i=2+(((op>>4)&3)<<1); v2=st[i]; v=st[i+1]
+                _burst_wr(mem,dirty,a2,v); _burst_wr(mem,dirty,a,v2); sp=a2
+            elif op==0xCB:
+                s=b1&7; g=b1>>6; bit=(b1>>3)&7; k=_BURST_CB[b1]
+                if s==6:
+                    v=_burst_rd(st,mem,rom,hl)
+                    if v<0 or (g!=1 and not _burst_wok(hl)): why=_X_OP; break
+                else: v=st[_BURST_R8[s]]
+                if g==0:                            # RLC RRC RL RR SLA SRA SWAP SRL
+                    if bit==0: r=((v<<1)|(v>>7))&0xFF; fc=v>>7
+                    elif bit==1: r=(v>>1)|((v&1)<<7); fc=v&1
+                    elif bit==2: r=((v<<1)|fc)&0xFF; fc=v>>7
+                    elif bit==3: r=(v>>1)|(fc<<7); fc=v&1
+                    elif bit==4: r=(v<<1)&0xFF; fc=v>>7
+                    elif bit==5: r=(v>>1)|(v&0x80); fc=v&1
+                    elif bit==6: r=((v&0xF)<<4)|(v>>4); fc=0
+                    else: r=v>>1; fc=v&1
+                    fz=int(r==0); fn=0; fh=0
+                elif g==1: r=v; fz=int(v&(1<<bit)==0); fn=0; fh=1
+                elif g==2: r=v&(0xFF^(1<<bit))
+                else: r=v|(1<<bit)
+                if g!=1:
+                    if s==6: _burst_wr(mem,dirty,hl,r)
+                    else: st[_BURST_R8[s]]=r
+            elif op==0xE0 or op==0xE2 or op==0xEA:  # LDH (a8),A / LD (C),A / LD (a16),A
+                a=0xFF00|b1 if op==0xE0 else 0xFF00|st[C] if op==0xE2 else b1|(b2<<8)
+                if not _burst_wok(a): why=_X_OP; break
+                _burst_wr(mem,dirty,a,st[A])
+            elif op==0xF0 or op==0xF2 or op==0xFA:
+                a=0xFF00|b1 if op==0xF0 else 0xFF00|st[C] if op==0xF2 else b1|(b2<<8)
+                v=_burst_rd(st,mem,rom,a)
+                if v<0: why=_X_OP; break
+                st[A]=v
+            elif op==0xE8 or op==0xF8:              # ADD SP,r8 / LD HL,SP+r8
+                r=(sp+((b1^0x80)-0x80))&0xFFFF
+                fz=0; fn=0; fh=int((sp&0xF)+(b1&0xF)>0xF); fc=int((sp&0xFF)+b1>0xFF)
+                if op==0xE8: sp=r
+                else: st[H]=r>>8; st[L]=r&0xFF
+            elif op==0xE9: npc=hl
+            elif op==0xF9: sp=hl
+            else: why=_X_OP; break
+            pc=npc; cyc+=k
+            # Timer.step for this instruction
+            d=st[_S_DIV]; nd=(d+k)&0xFFFF; st[_S_DIV]=nd
+            if tbit>=0 and (d>>tbit)&1 and not (nd>>tbit)&1:
+                t=(st[_S_TIMA]+1)&0xFF; st[_S_TIMA]=t
+                if t==0: why=_X_TIMA; break
+        st[_S_PC]=pc; st[_S_SP]=sp
+        st[_S_FZ]=fz; st[_S_FN]=fn; st[_S_FH]=fh; st[_S_FC]=fc
+        st[_S_EXIT]=why
+        return cyc
+
+    def _warm_cpu_burst():
+        # compile (or load from the cache) now, not on the first frame
+        rom=np.zeros(0x8000,np.uint8); rom.flags.writeable=False
+        _cpu_burst(np.zeros(_ST_LEN,np.int64),np.zeros(0x10000,np.uint8),rom,np.zeros(384,np.uint8),0)
+else:
+    _cpu_burst = None
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -700,25 +1575,111 @@ class GameBoy:
         self.running=False; self.total_cyc=0
 
     def load(self, data: bytes):
-        self.cart=Cartridge(data)
-        self.ppu=PPU(); self.timer=Timer(); self.joy=Joypad()
-        self.mmu=MMU(self.cart,self.ppu,self.timer,self.joy)
-        self.cpu=CPU(self.mmu)
+        # everything is built first and assigned at the end, so a ROM that
+        # fails to load leaves the previous machine untouched
+        cart=Cartridge(data)
+        mem=bytearray(0x10000)
+        ppu=PPU(mem); timer=Timer(); joy=Joypad()
+        mmu=MMU(cart,ppu,timer,joy,mem)
+        cpu=CPU(mmu)
+        rec=Recompiler(cpu,ppu)
+        burst=None
+        if _cpu_burst is not None:
+            # NumPy views for the CPU kernel: flat memory, the whole ROM
+            # (padded like _bank_view pads a short image), tile dirty marks.
+            # The MBCs never select past bank 0x7F whatever the header
+            # claims, so the padding stops there
+            rom=cart.rom; need=min(cart.num_rom_banks,0x80)*0x4000
+            if len(rom)>=need: romv=np.frombuffer(rom,np.uint8)
+            else:
+                romv=np.full(need,0xFF,np.uint8); romv[:len(rom)]=np.frombuffer(rom,np.uint8)
+                romv.flags.writeable=False
+            burst=(np.zeros(_ST_LEN,np.int64),np.frombuffer(mem,np.uint8),
+                   romv,np.frombuffer(ppu._tile_dirty,np.uint8))
+        self.cart=cart; self.ppu=ppu; self.timer=timer; self.joy=joy
+        self.mmu=mmu; self.cpu=cpu; self.rec=rec; self._burst=burst
         self.total_cyc=0
 
     def run_frame(self):
-        if not self.cpu: return
-        target=self.total_cyc+CYCLES_PER_FRAME
-        while self.total_cyc<target:
-            before=self.cpu.cycles
-            self.cpu.step()
-            elapsed=self.cpu.cycles-before
-            self.total_cyc+=elapsed
-            vb,st=self.ppu.step(elapsed)
-            ti=self.timer.step(elapsed)
-            if vb: self.mmu.IF|=INT_VBLANK
-            if st: self.mmu.IF|=INT_STAT
-            if ti: self.mmu.IF|=INT_TIMER
+        self.run_slice(CYCLES_PER_FRAME)
+
+    def run_slice(self, n_cyc):
+        # run about n_cyc machine cycles; frames are just slices of 70224
+        cpu=self.cpu
+        if not cpu: return
+        mmu=self.mmu; ppu=self.ppu; timer=self.timer
+        ppu_step=ppu.step; timer_step=timer.step
+        fetch=cpu._fetch; ops=cpu._OP_TABLE; cycles=cpu._CYCLES
+        lookup=self.rec.lookup; reg=cpu.reg; mem=mmu.mem
+        burst=self._burst; cart=self.cart
+        total=self.total_cyc; target=total+n_cyc
+        # CPU.step inlined; PPU and timer are only called when they have
+        # more to do than count cycles
+        while total<target:
+            # CPU kernel / recompiled block: only when nothing outside the
+            # CPU can change before it ends (no interrupt due, no PPU mode
+            # change, no TIMA overflow)
+            pc=cpu.pc
+            if burst and not cpu._ime_pending and not cpu.halted and not timer._of \
+                    and not (cpu.ime and mmu.IE&mmu.IF&0x1F):
+                lcd=ppu.lcdc&0x80; room=target-total
+                if lcd and ppu._limit-ppu.cycles<=room: room=ppu._limit-ppu.cycles-1
+                if room>=4:
+                    st,mv,rv,dv=burst
+                    st[:8]=reg
+                    st[8:23]=(pc,cpu.sp,cpu._fz,cpu._fn,cpu._fh,cpu._fc,timer.div,timer.tima,
+                              timer._bit if timer._enabled else -1,cart.rom1_bank<<14,
+                              mmu.IF,mmu.IE,ppu.lcdc,ppu.stat,ppu.ly)
+                    c=_cpu_burst(st,mv,rv,dv,room)
+                    if c:
+                        s=st.tolist(); reg[:]=s[:8]
+                        cpu.pc,cpu.sp,cpu._fz,cpu._fn,cpu._fh,cpu._fc,timer.div,timer.tima=s[8:16]
+                        if s[_S_EXIT]==_X_TIMA: timer._of=True; timer._of_d=4
+                        cpu.cycles+=c; total+=c
+                        if lcd: ppu.cycles+=c
+                        # stopped on an instruction it leaves to Python: run
+                        # that now rather than re-entering the kernel first
+                        if s[_S_EXIT]!=_X_OP or total>=target: continue
+            elif (pc<0x8000 and not burst and not cpu._ime_pending and not cpu.halted
+                    and not (cpu.ime and mmu.IE&mmu.IF&0x1F)):
+                blk=lookup(pc)
+                if blk:
+                    m=blk.max_cyc; lcd=ppu.lcdc&0x80
+                    if (total+m<=target and not timer._of and timer.tima+blk.n_ops<0x100
+                            and (not lcd or ppu.cycles+m<ppu._limit)):
+                        c=blk(cpu,reg,mem)
+                        if c:
+                            cpu.cycles+=c; total+=c
+                            if lcd: ppu.cycles+=c
+                            if timer._enabled:
+                                # Timer.step per instruction, minus the calls
+                                b=timer._bit; d=timer.div
+                                for k in blk.seq[c]:
+                                    nd=(d+k)&0xFFFF
+                                    if (d>>b)&1 and not (nd>>b)&1: timer.tima+=1
+                                    d=nd
+                                timer.div=d
+                            else: timer.div=(timer.div+c)&0xFFFF
+                            continue
+            before=cpu.cycles
+            if cpu._ime_pending>0:
+                cpu._ime_pending-=1
+                if cpu._ime_pending==0: cpu.ime=True
+            if mmu.IE&mmu.IF&0x1F: cpu.handle_interrupts()
+            if cpu.halted: cpu.cycles+=4
+            else:
+                op=fetch(); ops[op](cpu); cpu.cycles+=cycles[op]
+            elapsed=cpu.cycles-before
+            total+=elapsed
+
+            if ppu.lcdc&0x80:
+                c=ppu.cycles+elapsed
+                if c<ppu._limit: ppu.cycles=c
+                else: mmu.IF|=ppu_step(elapsed)
+            if timer._enabled or timer._of:
+                if timer_step(elapsed): mmu.IF|=INT_TIMER
+            else: timer.div=(timer.div+elapsed)&0xFFFF
+        self.total_cyc=total
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -754,28 +1715,62 @@ C_SPLASH_HI = "#666666"
 FONT_UI     = ("Segoe UI", 9) if sys.platform == "win32" else ("DejaVu Sans", 9)
 FONT_MONO   = ("Consolas", 9) if sys.platform == "win32" else ("DejaVu Sans Mono", 9)
 FONT_STATUS = ("Consolas", 8) if sys.platform == "win32" else ("DejaVu Sans Mono", 8)
+FONT_SPLASH_TITLE = ("Consolas", 13, "bold") if sys.platform == "win32" else ("DejaVu Sans Mono", 11, "bold")
+FONT_SPLASH_SUB   = ("Consolas", 9) if sys.platform == "win32" else ("DejaVu Sans Mono", 8)
+FONT_ABOUT_TITLE  = ("Consolas", 14, "bold") if sys.platform == "win32" else ("DejaVu Sans Mono", 12, "bold")
+
+# ── Selectable DMG shade sets (Settings → GB Palette) ─────────────────
+GB_PALETTES = {
+    "DMG Green"  : [(0xE8,0xF8,0xD0),(0x88,0xC0,0x70),(0x34,0x68,0x56),(0x08,0x18,0x20)],
+    "Grey"       : [(0xEF,0xEF,0xEF),(0xAA,0xAA,0xAA),(0x55,0x55,0x55),(0x00,0x00,0x00)],
+    "Amber"      : [(0xFF,0xF7,0x7D),(0xF0,0xA0,0x00),(0xA0,0x50,0x00),(0x20,0x10,0x00)],
+    "Blue LCD"   : [(0xC0,0xD0,0xFF),(0x70,0x90,0xE0),(0x20,0x40,0x90),(0x00,0x08,0x30)],
+}
+
+# ── Help → About text ─────────────────────────────────────────────────
+_ABOUT_DETAILS = (
+    "Game Boy (DMG) Emulator\n\n"
+    "SM83 CPU  ·  PPU Scanline Renderer\n"
+    "MBC1 / MBC3  ·  Timer  ·  Joypad\n"
+    "~59.7 FPS  ·  70224 cyc/frame\n\n"
+    "Team Flames / Samsoft  © 2026\n"
+)
+_ABOUT_TITLE_KW  = {"bg": C_BG, "fg": "#dddddd", "font": FONT_ABOUT_TITLE}
+_ABOUT_LABEL_KW  = {"bg": C_BG, "fg": C_STATUS_FG, "font": FONT_MONO, "justify": "center"}
+_ABOUT_BUTTON_KW = {"bg": C_MENU_BG, "fg": C_MENU_FG, "relief": tk.FLAT}
 
 
 class CatsGBApp:
     SCALE = 3   # default 3× → 480×432
+    MAX_BURST = 8   # most frames the emu thread runs between two publishes
 
     def __init__(self, root: tk.Tk):
         self.root       = root
         self.gb         = GameBoy()
-        self.lock       = Lock()
-        self._running   = True
+        self._stop      = Event()       # set once on quit; both loops watch it
         self._paused    = False
-        self._frame_buf = None          # bytes of latest rendered frame
         self._photo     = None          # ImageTk ref-keeper
+        self._about_win = None          # Help → About, built on first open
+        self._view_s    = self.SCALE    # integer scale that fits the canvas
+        self._ready     = deque(maxlen=1)   # newest frame, emu → GUI
+        # frame copies rotate through three preallocated buffers: one being
+        # written, one waiting in _ready, one the GUI may still be drawing
+        self._bufs      = [bytearray(len(PPM_HEADER) + GB_W*GB_H*3) for _ in range(3)]
+        self._buf_i     = 0
+        self._sent_s    = 0             # scale of the last published frame
         self._fps       = 0
         self._frame_cnt = 0
-        self._fps_ts    = time.time()
+        self._fps_ts    = time.perf_counter()
+        self._fps_shown = None          # (fps, speed) now on the label
         self._rom_path  = ""
         self._rom_name  = ""
         self._speed     = 1.0           # fast-forward multiplier
         self._ss_slot   = 1             # active save-state slot
         self._recent    : list[str] = []
         self._ff_active = False
+        self._wake      = Event()       # cuts the emu thread's wait short
+        self._jobs      = deque()       # callables the emu thread runs between frames
+        self._notes     = deque()       # status messages from the emu thread
 
         # save-state storage (in-memory, 9 slots)
         self._save_slots: dict[int, bytes] = {}
@@ -788,7 +1783,6 @@ class CatsGBApp:
         self._bind_mouse()
 
         Thread(target=self._emu_loop, daemon=True).start()
-        self._gui_tick()
 
     # ══════════════════════════════════════════════════════════════
     #  WINDOW SETUP
@@ -801,6 +1795,7 @@ class CatsGBApp:
         self.root.resizable(True, True)
         self.root.geometry(f"{sw}x{sh + 22 + 19}")   # screen + menu + status
         self.root.minsize(GB_W, GB_H + 22 + 19)
+        self.root.protocol("WM_DELETE_WINDOW", self._quit)
 
     # ══════════════════════════════════════════════════════════════
     #  MENU BAR  (mGBA layout)
@@ -895,13 +1890,7 @@ class CatsGBApp:
         sep(stm)
         pal_m = tk.Menu(stm, **kw_m)
         stm.add_cascade(label="GB Palette", menu=pal_m)
-        palettes = {
-            "DMG Green"  : [(0xE8,0xF8,0xD0),(0x88,0xC0,0x70),(0x34,0x68,0x56),(0x08,0x18,0x20)],
-            "Grey"       : [(0xEF,0xEF,0xEF),(0xAA,0xAA,0xAA),(0x55,0x55,0x55),(0x00,0x00,0x00)],
-            "Amber"      : [(0xFF,0xF7,0x7D),(0xF0,0xA0,0x00),(0xA0,0x50,0x00),(0x20,0x10,0x00)],
-            "Blue LCD"   : [(0xC0,0xD0,0xFF),(0x70,0x90,0xE0),(0x20,0x40,0x90),(0x00,0x08,0x30)],
-        }
-        for name, pal in palettes.items():
+        for name, pal in GB_PALETTES.items():
             pal_m.add_command(label=name, command=lambda p=pal: self._set_palette(p))
 
         sep(stm)
@@ -931,11 +1920,40 @@ class CatsGBApp:
             cursor="arrow",
         )
         self.screen.pack(side="top", fill="both", expand=True)
+        # Items are created once; frames only move / retarget them
+        self._bg_id  = self.screen.create_rectangle(0, 0, 1, 1, fill=C_SCREEN_BG, outline="")
+        self._img_id = self.screen.create_image(0, 0, anchor="nw", state="hidden")
+        self._splash_ids = (
+            self.screen.create_text(0, 0, text="Cat's Gameboy 0.1",
+                                    fill=C_SPLASH_HI, font=FONT_SPLASH_TITLE),
+            self.screen.create_text(0, 0, text="File  →  Load ROM…",
+                                    fill=C_SPLASH_FG, font=FONT_SPLASH_SUB),
+        )
         self.screen.bind("<Configure>", self._on_resize)
         self._draw_splash()
 
+    # <Configure> arrives at pointer rate while dragging an edge — keep the
+    # newest size and redraw at most once per 16 ms, only if it changed
+    _resize_pending = False
+    _drawn_size = None
+
     def _on_resize(self, event):
+        self._view_s = max(1, min(event.width // GB_W, event.height // GB_H))
+        self._new_size = (event.width, event.height)
+        if not self._resize_pending:
+            self._resize_pending = True
+            self.root.after(16, self._do_redraw)
+
+    def _do_redraw(self):
+        self._resize_pending = False
+        if self._new_size == self._drawn_size: return
+        self._drawn_size = self._new_size
+        self.screen.coords(self._bg_id, 0, 0, *self._new_size)
         self._redraw_current()
+        # the core scales frames; with nothing new coming (paused, static
+        # screen) ask it to send the last one again at the new scale
+        if self._photo is not None and self._view_s != self._sent_s:
+            self._on_core(self._republish)
 
     def _redraw_current(self):
         if self._photo:
@@ -945,31 +1963,36 @@ class CatsGBApp:
 
     # ── Splash (no ROM loaded) ─────────────────────────────────
     def _draw_splash(self):
-        self.screen.delete("all")
-        w = self.screen.winfo_width()  or GB_W * self.SCALE
-        h = self.screen.winfo_height() or GB_H * self.SCALE
+        sc = self.screen
+        w = sc.winfo_width()  or GB_W * self.SCALE
+        h = sc.winfo_height() or GB_H * self.SCALE
         # dark bg
-        self.screen.create_rectangle(0, 0, w, h, fill=C_SPLASH_BG, outline="")
+        sc.itemconfig(self._bg_id, fill=C_SPLASH_BG)
+        sc.itemconfig(self._img_id, state="hidden", image="")
         # centred logo text — mGBA shows nothing, we show a minimal stamp
         cx, cy = w // 2, h // 2
-        self.screen.create_text(cx, cy - 12, text="Cat's Gameboy 0.1",
-                                 fill=C_SPLASH_HI, font=("Consolas",13,"bold")
-                                 if sys.platform=="win32" else ("DejaVu Sans Mono",11,"bold"))
-        self.screen.create_text(cx, cy + 10, text="File  →  Load ROM…",
-                                 fill=C_SPLASH_FG,
-                                 font=("Consolas",9) if sys.platform=="win32" else ("DejaVu Sans Mono",8))
+        title, hint = self._splash_ids
+        sc.coords(title, cx, cy - 12); sc.coords(hint, cx, cy + 10)
+        sc.itemconfig(title, state="normal"); sc.itemconfig(hint, state="normal")
+        self._splash_on = True
 
     # ── Blit a PIL ImageTk to the canvas, letterboxed ──────────
     def _blit_photo(self, photo):
-        self.screen.delete("all")
-        cw = self.screen.winfo_width()  or GB_W * self.SCALE
-        ch = self.screen.winfo_height() or GB_H * self.SCALE
-        self.screen.create_rectangle(0, 0, cw, ch, fill=C_SCREEN_BG, outline="")
-        # centre it
-        iw, ih = photo.width(), photo.height()
+        sc = self.screen
+        cw = sc.winfo_width()  or GB_W * self.SCALE
+        ch = sc.winfo_height() or GB_H * self.SCALE
+        if self._splash_on:
+            self._splash_on = False
+            sc.itemconfig(self._bg_id, fill=C_SCREEN_BG)
+            for i in self._splash_ids: sc.itemconfig(i, state="hidden")
+        # centre it (ask Tk: a reused ImageTk photo may be clipped below
+        # the size it was created with)
+        iw = int(sc.tk.call("image", "width", str(photo)))
+        ih = int(sc.tk.call("image", "height", str(photo)))
         x = (cw - iw) // 2
         y = (ch - ih) // 2
-        self.screen.create_image(x, y, anchor="nw", image=photo)
+        sc.coords(self._img_id, x, y)
+        sc.itemconfig(self._img_id, image=photo, state="normal")
 
     # ══════════════════════════════════════════════════════════════
     #  STATUS BAR  (1 row, like mGBA)
@@ -995,122 +2018,211 @@ class CatsGBApp:
         self._status_left.set(f"  {msg}" if msg else "  Ready")
 
     def _update_fps_label(self, fps):
+        # StringVar.set fires Tk traces and a relayout — only on a change
+        if (fps, self._speed) == self._fps_shown: return
+        self._fps_shown = (fps, self._speed)
         spd = "" if self._speed==1.0 else f"  {int(self._speed*100)}%"
         self._status_right.set(f"FPS: {fps}{spd}   ")
 
     # ══════════════════════════════════════════════════════════════
     #  EMULATION THREAD
     # ══════════════════════════════════════════════════════════════
+    # Sleeps until the next frame's deadline instead of polling; pause,
+    # speed, ROM and quit changes set _wake so the wait ends at once.
     def _emu_loop(self):
         frame_dur = 1.0 / 59.7
-        last = time.perf_counter()
-        while self._running:
+        wake = self._wake
+        deadline = time.perf_counter()
+        jobs = self._jobs
+        cost = 0.0          # moving average of one frame's wall time
+        part = 0            # quarters of the current frame already run
+        stop = self._stop
+        while not stop.is_set():
+            while jobs: jobs.popleft()()
             if self._paused or not self.gb.cart:
-                time.sleep(0.005)
+                wake.wait(0.25); wake.clear()
+                deadline = time.perf_counter()
                 continue
 
             eff_dur = frame_dur / max(self._speed, 0.01) if self._speed > 0 else 0
 
-            now = time.perf_counter()
-            if now - last >= (eff_dur if eff_dur > 0 else 0):
-                self.gb.run_frame()
-                if self.gb.ppu.frame_ready:
-                    with self.lock:
-                        self._frame_buf = bytes(self.gb.ppu.pixels)
-                    self.gb.ppu.frame_ready = False
-                self._frame_cnt += 1
-                last += eff_dur if eff_dur > 0 else (now - last)
+            dt = deadline - time.perf_counter()
+            if dt > 0:
+                wake.wait(dt); wake.clear()
+                continue
+            t0 = time.perf_counter()
+            if part or (eff_dur > 0 and cost > 0.6 * eff_dur):
+                # Little headroom: the frame in quarter slices, looking at
+                # pause/quit/queued jobs in between instead of once a frame.
+                # A frame cut short carries on from the same quarter.
+                k = 0
+                while part < 4:
+                    self.gb.run_slice(CYCLES_PER_FRAME // 4); part += 1; k += 1
+                    if jobs or self._paused or stop.is_set(): break
+                n = k / 4               # frames' worth of time spent
+                done = part // 4; part %= 4
             else:
-                time.sleep(0.001)
+                # Behind the deadline (or unthrottled): run the frames owed
+                # in one burst and publish only the last — the rest would
+                # never reach the screen anyway. Capped to keep input responsive.
+                n = done = min(self.MAX_BURST, 1 + int(-dt / eff_dur)) if eff_dur > 0 else self.MAX_BURST
+                run_frame = self.gb.run_frame
+                for _ in range(n): run_frame()
+            cost += ((time.perf_counter() - t0) / n - cost) * 0.25
+            deadline = deadline + n * eff_dur if eff_dur > 0 else time.perf_counter()
+            if done:
+                self._frame_cnt += done
+                self._prepare_frame()
+
+    # ── Queue work that must not race the core (save/load state) ──
+    def _on_core(self, fn):
+        self._jobs.append(fn)
+        self._wake.set()
 
     # ══════════════════════════════════════════════════════════════
-    #  GUI TICK  (~60 Hz)
+    #  HOST LOOP  (replaces root.mainloop)
     # ══════════════════════════════════════════════════════════════
-    def _gui_tick(self):
-        if not self._running:
-            return
+    FRAME_S = 1.0 / 59.7275     # DMG refresh: 4194304 / 70224 Hz
+
+    def run(self):
+        # Pump Tk, then present the newest frame, once per GB frame at a
+        # perf_counter deadline — no after() callback chain. The core
+        # keeps running its 70224-cycle frames on the emu thread.
+        root = self.root; stop = self._stop
+        deadline = time.perf_counter()
+        while not stop.is_set():
+            try: root.update()
+            except tk.TclError: break       # window already destroyed
+            if stop.is_set(): break
+            self._gui_tick()
+            deadline += self.FRAME_S
+            dt = deadline - time.perf_counter()
+            if dt > 0: time.sleep(dt)
+            else: deadline = time.perf_counter()
+        # one last pump so the after_idle(root.destroy) from quit runs
+        try: root.update()
+        except tk.TclError: pass
 
-        # grab latest frame
-        with self.lock:
-            buf = self._frame_buf
-            self._frame_buf = None
-
-        if buf:
-            self._render_frame(buf)
+    def _gui_tick(self):
+        self._draw_ready()
+        while self._notes: self._set_status(self._notes.popleft())
 
         # FPS counter every second
-        now = time.time()
+        now = time.perf_counter()
         if now - self._fps_ts >= 1.0:
             self._fps = self._frame_cnt
             self._frame_cnt = 0
             self._fps_ts = now
             self._update_fps_label(self._fps)
 
-        self.root.after(16, self._gui_tick)
-
-    # ── Render raw RGB bytes → PIL → canvas ───────────────────
+    # ── Draw the frame waiting in _ready, if any ──────────────
+    def _draw_ready(self):
+        try: frame = self._ready.popleft()
+        except IndexError: return
+        # with PIL the producer already scaled it — only the Tk side is left here
+        if PIL: self._show_image(frame)
+        else: self._render_frame(frame)
+
+    # ── Copy out the PPU's front buffer once a new frame is ready ──
+    def _take_frame(self):
+        ppu = self.gb.ppu
+        if not ppu.frame_ready:
+            return None
+        ppu.frame_ready = False
+        i = self._buf_i = (self._buf_i + 1) % 3
+        buf = self._bufs[i]
+        buf[:] = ppu.pixels_front     # same size: a plain memcpy, no realloc
+        return buf
+
+    # ── Emu thread: publish the finished frame for the GUI ─────
+    # Only this thread touches the PPU buffers; the GUI gets the copy
+    # through a one-slot deque (append/popleft are atomic, the newest
+    # frame replaces an unread one). Tk objects must stay on the main
+    # thread, so with PIL just the scaling moves here.
+    def _prepare_frame(self):
+        ppu = self.gb.ppu; s = self._view_s
+        # static screens (menus, pause, title) repeat the last frame byte
+        # for byte; one memcmp skips the copy, the scale and the redraw
+        if (ppu.frame_ready and s == self._sent_s and self._photo is not None
+                and ppu.pixels_front == self._bufs[self._buf_i]):
+            ppu.frame_ready = False
+            return
+        buf = self._take_frame()
+        if buf:
+            self._sent_s = s
+            self._ready.append(self._scale_frame(buf, s) if PIL else buf)
+
+    def _republish(self):
+        s = self._view_s
+        if s == self._sent_s or not self.gb.cart: return
+        self._sent_s = s; buf = self._bufs[self._buf_i]
+        self._ready.append(self._scale_frame(buf, s) if PIL else buf)
+
+    @staticmethod
+    def _scale_frame(buf: bytes, s: int):
+        # frombuffer aliases buf — no copy before the resize
+        img = Image.frombuffer("RGB", (GB_W, GB_H), memoryview(buf)[len(PPM_HEADER):], "raw", "RGB", 0, 1)
+        return img.resize((GB_W * s, GB_H * s), Image.NEAREST) if s > 1 else img
+
+    # ── Scaled PIL image → canvas ──────────────────────────────
+    def _show_image(self, img):
+        # One Tk photo per ROM, allocated at the largest menu scale; a
+        # scale change only re-clips its -width/-height, and paste()
+        # writes each frame into it in place
+        photo = self._photo
+        if not isinstance(photo, ImageTk.PhotoImage):
+            w4, h4 = GB_W * 4, GB_H * 4
+            photo = self._photo = ImageTk.PhotoImage("RGB", (w4, h4), width=w4, height=h4)
+            self._photo_size = None
+        if img.size != self._photo_size:
+            self._photo_size = img.size
+            photo.tk.call(str(photo), "configure", "-width", img.size[0], "-height", img.size[1])
+        photo.paste(img)
+        self._blit_photo(photo)
+
+    # ── Reusable s× PPM (header + pixels) and a 5-D view of its pixels ──
+    _ppm_cache = None
+    def _ppm_scaled(self, s):
+        if self._ppm_cache is None or self._ppm_cache[0] != s:
+            hdr = f"P6\n{GB_W*s} {GB_H*s}\n255\n".encode()
+            data = bytearray(hdr) + bytearray(GB_W*s*GB_H*s*3)
+            dst = np.frombuffer(data, np.uint8, offset=len(hdr)).reshape(GB_H, s, GB_W, s, 3)
+            self._ppm_cache = (s, data, dst)
+        return self._ppm_cache[1:]
+
+    # ── No-PIL fallback: PPM bytes → canvas ────────────────────
     def _render_frame(self, buf: bytes):
-        cw = self.screen.winfo_width()  or GB_W * self.SCALE
-        ch = self.screen.winfo_height() or GB_H * self.SCALE
-
-        if PIL:
-            img = Image.frombytes("RGB", (GB_W, GB_H), buf)
-            # Integer scale that fits the canvas
-            sx = max(1, cw // GB_W)
-            sy = max(1, ch // GB_H)
-            s  = min(sx, sy)
-            img = img.resize((GB_W * s, GB_H * s), Image.NEAREST)
-            self._photo = ImageTk.PhotoImage(img)
+        s = self._view_s
+        # buf already carries its P6 header, so Tk decodes the whole frame
+        # in one call; the integer scale is done by NumPy when present (one
+        # decode at full size), else by zoom()
+        if np is not None and s > 1:
+            data, dst = self._ppm_scaled(s)
+            src = np.frombuffer(buf, np.uint8, offset=len(PPM_HEADER)).reshape(GB_H, 1, GB_W, 1, 3)
+            dst[:] = src        # broadcast: the upscale lands in place, no temporaries
+            self._photo = tk.PhotoImage(data=base64.b64encode(data), format="PPM")
         else:
-            # Fallback — just draw coloured rectangles (slow)
-            self._photo = None
-            self.screen.delete("all")
-            self.screen.create_rectangle(0,0,cw,ch,fill=C_SCREEN_BG,outline="")
-            sx = max(1, cw // GB_W); sy = max(1, ch // GB_H); s = min(sx,sy)
-            ox = (cw - GB_W*s) // 2; oy = (ch - GB_H*s) // 2
-            for y in range(GB_H):
-                for x in range(GB_W):
-                    i = (y*GB_W+x)*3
-                    r,g,b = buf[i],buf[i+1],buf[i+2]
-                    self.screen.create_rectangle(
-                        ox+x*s, oy+y*s, ox+(x+1)*s, oy+(y+1)*s,
-                        fill=f"#{r:02X}{g:02X}{b:02X}", outline="")
-            return
-
+            photo = tk.PhotoImage(data=base64.b64encode(buf), format="PPM")
+            self._photo = photo.zoom(s) if s > 1 else photo
         self._blit_photo(self._photo)
 
     # ══════════════════════════════════════════════════════════════
     #  KEY / MOUSE BINDINGS
     # ══════════════════════════════════════════════════════════════
     def _bind_keys(self):
+        J = Joypad
         km = {
-            "z":"a","x":"b",
-            "Return":"start","BackSpace":"sel","KP_Enter":"start",
-            "Up":"up","Down":"down","Left":"left","Right":"right",
-            "w":"up","s":"down","a":"left","d":"right",
+            "z":J.A,"x":J.B,
+            "Return":J.START,"BackSpace":J.SELECT,"KP_Enter":J.START,
+            "Up":J.UP,"Down":J.DOWN,"Left":J.LEFT,"Right":J.RIGHT,
+            "w":J.UP,"s":J.DOWN,"a":J.LEFT,"d":J.RIGHT,
         }
         def dn(e):
-            j = self.gb.joy
-            k = km.get(e.keysym)
-            if k=="a":     j.a=True
-            elif k=="b":   j.b=True
-            elif k=="start": j.start=True
-            elif k=="sel":   j.sel=True
-            elif k=="up":    j.up=True
-            elif k=="down":  j.down=True
-            elif k=="left":  j.left=True
-            elif k=="right": j.right=True
+            m = km.get(e.keysym)
+            if m: self.gb.joy.state |= m
         def up(e):
-            j = self.gb.joy
-            k = km.get(e.keysym)
-            if k=="a":     j.a=False
-            elif k=="b":   j.b=False
-            elif k=="start": j.start=False
-            elif k=="sel":   j.sel=False
-            elif k=="up":    j.up=False
-            elif k=="down":  j.down=False
-            elif k=="left":  j.left=False
-            elif k=="right": j.right=False
+            m = km.get(e.keysym)
+            if m: self.gb.joy.state &= ~m
 
         self.root.bind("<KeyPress>",   dn)
         self.root.bind("<KeyRelease>", up)
@@ -1160,21 +2272,41 @@ class CatsGBApp:
         if not path:
             return
         try:
-            data = open(path,"rb").read()
-            self.gb.load(data)
+            self._boot(self._map_rom_file(path))
             self._rom_path = path
             self._rom_name = self.gb.cart.name or os.path.basename(path)
             self._paused   = False
             self._photo    = None
+            self._wake.set()
             self._update_title()
             self._set_status(os.path.basename(path))
             self._add_recent(path)
         except Exception as exc:
             messagebox.showerror("Load ROM", str(exc))
 
+    def _boot(self, data):
+        # The emu thread may be mid-frame: build the new machine aside and
+        # swap it in with one assignment, never reload the running one.
+        # Whatever slice the old one is in finishes on the old objects
+        gb = GameBoy(); gb.load(data)
+        self.gb = gb
+
+    @staticmethod
+    def _map_rom_file(path):
+        # read-only, demand-paged view of the file; it outlives the fd.
+        # Empty files can't be mapped and pipes or some network mounts
+        # refuse to: read those instead
+        with open(path, "rb") as f:
+            try:
+                if os.fstat(f.fileno()).st_size:
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError): pass
+            return f.read()
+
     def _close_rom(self):
-        self.gb.cart = None; self.gb.cpu = None
+        self.gb = GameBoy()
         self._photo = None; self._rom_name = ""; self._rom_path = ""
+        self._wake.set()
         self._draw_splash()
         self._update_title()
         self._set_status()
@@ -1197,11 +2329,10 @@ class CatsGBApp:
 
     def _load_path(self, path):
         try:
-            data = open(path,"rb").read()
-            self.gb.load(data)
+            self._boot(self._map_rom_file(path))
             self._rom_path = path
             self._rom_name = self.gb.cart.name or os.path.basename(path)
-            self._paused   = False; self._photo = None
+            self._paused   = False; self._photo = None; self._wake.set()
             self._update_title(); self._set_status(os.path.basename(path))
         except Exception as exc:
             messagebox.showerror("Load ROM", str(exc))
@@ -1244,10 +2375,10 @@ class CatsGBApp:
         cs = 0
         for i in range(0x134,0x14D): cs = (cs-data[i]-1)&0xFF
         data[0x14D] = cs
-        self.gb.load(bytes(data))
+        self._boot(bytes(data))
         self._rom_name = "[Test Pattern]"
         self._rom_path = ""
-        self._paused   = False; self._photo = None
+        self._paused   = False; self._photo = None; self._wake.set()
         self._update_title()
         self._set_status("[Test Pattern]")
 
@@ -1256,6 +2387,7 @@ class CatsGBApp:
     # ══════════════════════════════════════════════════════════════
     def _toggle_pause(self):
         self._paused = not self._paused
+        self._wake.set()
         state = "Paused" if self._paused else os.path.basename(self._rom_path or "")
         self._set_status(("⏸  Paused  —  " + self._rom_name) if self._paused else self._rom_name)
         # dim screen slightly when paused
@@ -1264,20 +2396,19 @@ class CatsGBApp:
 
     def _reset(self):
         if self.gb.cart:
-            self.gb.load(bytes(self.gb.cart.rom))
-            self._paused = False
+            self._boot(self.gb.cart.rom)
+            self._paused = False; self._wake.set()
             self._set_status(f"Reset — {self._rom_name}")
 
     def _frame_advance(self):
+        # the frame runs on the emu thread, the only owner of the core;
+        # the next _gui_tick draws what it publishes
         if self.gb.cart:
-            self.gb.run_frame()
-            if self.gb.ppu.frame_ready:
-                buf = bytes(self.gb.ppu.pixels)
-                self.gb.ppu.frame_ready = False
-                self._render_frame(buf)
+            self._on_core(lambda: (self.gb.run_frame(), self._prepare_frame()))
 
     def _set_speed(self, mult):
         self._speed = max(0, mult)
+        self._wake.set()
         self._update_fps_label(self._fps)
 
     # ══════════════════════════════════════════════════════════════
@@ -1287,39 +2418,51 @@ class CatsGBApp:
         self._ss_slot = n
         self._set_status(f"Save-state slot: {n}")
 
+    # Snapshot layout: header (magic, version, A F B C D E H L, PC, SP,
+    # IME, HALT) followed by the raw WRAM · HRAM · VRAM · OAM bytes
+    _SS_HDR = struct.Struct("<4sH8BHHBB")
+    _SS_MAGIC, _SS_VER = b"CGB0", 1
+
+    # Both run on the emu thread between frames (see _on_core): the
+    # snapshot is consistent and F5/F8 never stall the Tk loop
     def _save_state(self, slot):
+        if self.gb.cpu: self._on_core(lambda: self._do_save_state(slot))
+
+    def _load_state(self, slot):
+        if slot not in self._save_slots: self._set_status(f"Slot {slot} is empty"); return
+        if self.gb.cpu: self._on_core(lambda: self._do_load_state(slot))
+
+    def _do_save_state(self, slot):
         if not self.gb.cpu: return
-        import pickle
         try:
-            snap = pickle.dumps({
-                'cpu_regs': (self.gb.cpu.a,self.gb.cpu.f,self.gb.cpu.b,self.gb.cpu.c,
-                             self.gb.cpu.d,self.gb.cpu.e,self.gb.cpu.h,self.gb.cpu.l,
-                             self.gb.cpu.pc,self.gb.cpu.sp,self.gb.cpu.ime,self.gb.cpu.halted),
-                'wram': bytes(self.gb.mmu.wram),
-                'hram': bytes(self.gb.mmu.hram),
-                'vram': bytes(self.gb.ppu.vram),
-                'oam':  bytes(self.gb.ppu.oam),
-            })
+            c = self.gb.cpu; mmu = self.gb.mmu; ppu = self.gb.ppu
+            c.reg[F] = c._get_f()
+            snap = b"".join((
+                self._SS_HDR.pack(self._SS_MAGIC, self._SS_VER, *c.reg,
+                                  c.pc, c.sp, c.ime, c.halted),
+                mmu.wram, mmu.hram, ppu.vram, ppu.oam))
             self._save_slots[slot] = snap
-            self._set_status(f"State saved to slot {slot}")
+            self._notes.append(f"State saved to slot {slot}")
         except Exception as e:
-            self._set_status(f"Save state failed: {e}")
+            self._notes.append(f"Save state failed: {e}")
 
-    def _load_state(self, slot):
-        if slot not in self._save_slots: self._set_status(f"Slot {slot} is empty"); return
+    def _do_load_state(self, slot):
         if not self.gb.cpu: return
-        import pickle
         try:
-            d = pickle.loads(self._save_slots[slot])
-            c = self.gb.cpu
-            c.a,c.f,c.b,c.c,c.d,c.e,c.h,c.l,c.pc,c.sp,c.ime,c.halted = d['cpu_regs']
-            self.gb.mmu.wram[:] = d['wram']
-            self.gb.mmu.hram[:] = d['hram']
-            self.gb.ppu.vram[:]  = d['vram']
-            self.gb.ppu.oam[:]   = d['oam']
-            self._set_status(f"State loaded from slot {slot}")
+            snap = memoryview(self._save_slots[slot])
+            magic, ver, *regs, pc, sp, ime, halted = self._SS_HDR.unpack_from(snap)
+            if (magic, ver) != (self._SS_MAGIC, self._SS_VER):
+                raise ValueError("unknown snapshot format")
+            c = self.gb.cpu; mmu = self.gb.mmu; ppu = self.gb.ppu
+            o = self._SS_HDR.size
+            for view in (mmu.wram, mmu.hram, ppu.vram, ppu.oam):
+                n = len(view); view[:] = snap[o:o+n]; o += n
+            c.reg[:] = regs; c._set_f(c.reg[F])
+            c.pc, c.sp, c.ime, c.halted = pc, sp, bool(ime), bool(halted)
+            ppu.invalidate_tiles()
+            self._notes.append(f"State loaded from slot {slot}")
         except Exception as e:
-            self._set_status(f"Load state failed: {e}")
+            self._notes.append(f"Load state failed: {e}")
 
     def _load_latest_state(self):
         if not self._save_slots: self._set_status("No states saved"); return
@@ -1363,26 +2506,23 @@ class CatsGBApp:
         c = tk.Canvas(win, width=cw, height=ch, bg="#111111", highlightthickness=0)
         c.pack(padx=8, pady=8)
 
-        pal_grey = [(0xFF,0xFF,0xFF),(0xAA,0xAA,0xAA),(0x55,0x55,0x55),(0x00,0x00,0x00)]
+        # colour index → grey level; the sheet is one P5 (greyscale) PPM
+        GREY = bytes([0xFF,0xAA,0x55,0x00]) + bytes(252)
+        header = f"P5\n{COLS*8} {ROWS*8}\n255\n".encode()
+        img_id = c.create_image(0, 0, anchor="nw")
 
         def refresh():
-            c.delete("all")
-            vram = self.gb.ppu.vram
-            for tile_idx in range(384):
-                tx = (tile_idx % COLS) * TILE_PX
-                ty = (tile_idx // COLS) * TILE_PX
-                addr = tile_idx * 16
-                for row in range(8):
-                    if addr+row*2+1 >= len(vram): break
-                    lo = vram[addr+row*2]
-                    hi = vram[addr+row*2+1]
-                    for col in range(8):
-                        bit = 7 - col
-                        ci = ((hi>>bit)&1)<<1 | ((lo>>bit)&1)
-                        r,g,b = pal_grey[ci]
-                        px = tx + col*2; py = ty + row*2
-                        c.create_rectangle(px,py,px+2,py+2,
-                                           fill=f"#{r:02X}{g:02X}{b:02X}",outline="")
+            v = bytes(self.gb.ppu.vram[:0x1800])
+            rows = []
+            for ty in range(ROWS):
+                base = ty * COLS * 16
+                for r in range(base, base + 16, 2):
+                    rows.append(b"".join([TILE_ROW_LUT[v[a]][v[a+1]]
+                                          for a in range(r, r + COLS*16, 16)]))
+            sheet = b"".join(rows).translate(GREY)
+            photo = tk.PhotoImage(data=base64.b64encode(header + sheet), format="PPM")
+            win._photo = photo.zoom(TILE_PX // 8)   # keep a ref on win
+            c.itemconfig(img_id, image=win._photo)
 
         refresh()
         tk.Button(win, text="Refresh", bg=C_MENU_BG, fg=C_MENU_FG,
@@ -1428,43 +2568,33 @@ class CatsGBApp:
                  font=FONT_MONO, justify="left").pack(padx=16, pady=12)
 
     def _about(self):
-        win = tk.Toplevel(self.root)
+        # built on first use, then only hidden and shown again
+        win = self._about_win
+        if win is not None and win.winfo_exists():
+            win.deiconify(); win.lift(); return
+        win = self._about_win = tk.Toplevel(self.root)
         win.title("About")
         win.configure(bg=C_BG)
         win.resizable(False, False)
-        tk.Label(win, text="Cat's Gameboy 0.1", bg=C_BG, fg="#dddddd",
-                 font=("Consolas",14,"bold") if sys.platform=="win32"
-                 else ("DejaVu Sans Mono",12,"bold")).pack(pady=(18,4))
-        details = (
-            "Game Boy (DMG) Emulator\n\n"
-            "SM83 CPU  ·  PPU Scanline Renderer\n"
-            "MBC1 / MBC3  ·  Timer  ·  Joypad\n"
-            "~59.7 FPS  ·  70224 cyc/frame\n\n"
-            "Team Flames / Samsoft  © 2026\n"
-        )
-        tk.Label(win, text=details, bg=C_BG, fg=C_STATUS_FG,
-                 font=FONT_MONO, justify="center").pack(padx=24, pady=(0,16))
-        tk.Button(win, text="  OK  ", bg=C_MENU_BG, fg=C_MENU_FG,
-                  relief=tk.FLAT, command=win.destroy).pack(pady=(0,14))
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
+        tk.Label(win, text=APP_NAME, **_ABOUT_TITLE_KW).pack(pady=(18,4))
+        tk.Label(win, text=_ABOUT_DETAILS, **_ABOUT_LABEL_KW).pack(padx=24, pady=(0,16))
+        tk.Button(win, text="  OK  ", command=win.withdraw,
+                  **_ABOUT_BUTTON_KW).pack(pady=(0,14))
 
     # ══════════════════════════════════════════════════════════════
     #  QUIT
     # ══════════════════════════════════════════════════════════════
     def _quit(self):
-        self._running = False
-        self.root.destroy()
+        self._stop.set()
+        self._wake.set()
+        self.root.after_idle(self.root.destroy)
 
 
 # ══════════════════════════════════════════════════════════════════════
 #  ENTRY
 # ══════════════════════════════════════════════════════════════════════
 if __name__ == "__main__":
+    if _cpu_burst is not None: _warm_cpu_burst()
     root = tk.Tk()
-    app  = CatsGBApp(root)
-
-    def _on_close():
-        app._running = False
-        root.destroy()
-
-    root.protocol("WM_DELETE_WINDOW", _on_close)
-    root.mainloop()
+    CatsGBApp(root).run()
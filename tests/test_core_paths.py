@@ -0,0 +1,142 @@
+"""Differential tests for the CPU fast paths.
+
+The block recompiler and the Numba CPU kernel must leave the machine
+exactly as the plain interpreter (CPU.step semantics, inlined in
+GameBoy.run_slice) would: same registers, memory, timer, PPU state and
+pixels after every frame.
+"""
+import os, random, sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import emugb4k as E
+
+
+def random_rom(seed):
+    # random bytes behind a valid header: exercises every opcode, bank
+    # switches, cart RAM and IO writes in no particular order
+    r = random.Random(seed)
+    data = bytearray(r.getrandbits(8) for _ in range(0x10000))
+    data[0x147] = r.choice((0x00, 0x01, 0x03, 0x13)); data[0x148] = 1; data[0x149] = 0
+    data[0x100:0x104] = bytes((0x00, 0xC3, 0x50, 0x01))    # NOP; JP $0150
+    return bytes(data)
+
+
+def boot(rom, path):
+    gb = E.GameBoy(); gb.load(rom)
+    if path != "burst": gb._burst = None
+    if path == "interp": gb.rec.lookup = lambda pc: None
+    return gb
+
+
+def state(gb):
+    c, m, p, t, k = gb.cpu, gb.mmu, gb.ppu, gb.timer, gb.cart
+    return dict(
+        cpu=(tuple(c.reg[r] for r in (E.A, E.B, E.C, E.D, E.E, E.H, E.L)), c._get_f(),
+             c.pc, c.sp, bool(c.ime), bool(c.halted), c._ime_pending, c.cycles),
+        mem=bytes(m.mem), irq=(m.IE, m.IF),
+        cart=(k.rom_bank, k.ram_bank, k.ram_enabled, bytes(k.ram)),
+        ppu=(p.lcdc, p.stat, p.scy, p.scx, p.ly, p.lyc, p.bgp, p.obp0, p.obp1,
+             p.wy, p.wx, p.mode, p.cycles, p.win_line),
+        pixels=(bytes(p.pixels_front), bytes(p.pixels_back)),
+        timer=(t.div, t.tima, t.tma, t.tac, t._of, t._of_d if t._of else 0),
+        total=gb.total_cyc)
+
+
+def run_same(rom, frames, path):
+    ref = boot(rom, "interp"); gb = boot(rom, path)
+    for f in range(frames):
+        ref.run_frame(); gb.run_frame()
+        a, b = state(ref), state(gb)
+        bad = [key for key in a if a[key] != b[key]]
+        assert not bad, f"frame {f}: {path} differs from the interpreter in {bad}"
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_recompiler_matches_interpreter(seed):
+    run_same(random_rom(seed), 20, "recomp")
+
+
+needs_numba = pytest.mark.skipif(E._cpu_burst is None, reason="Numba not installed")
+
+
+@needs_numba
+@pytest.mark.parametrize("seed", range(12))
+def test_cpu_kernel_matches_interpreter(seed):
+    run_same(random_rom(seed), 20, "burst")
+
+
+@needs_numba
+@pytest.mark.parametrize("hdr", (0x09, 0x20, 0x52, 0xFF))
+def test_cpu_kernel_with_bogus_rom_size(hdr):
+    # header 0x148 beyond the real codes must not size the padded ROM view
+    rom = bytearray(random_rom(3)); rom[0x148] = hdr
+    run_same(bytes(rom), 5, "burst")
+
+
+def _burst(gb, budget):
+    # one _cpu_burst call, marshalled the way run_slice does it
+    cpu, t, m, p = gb.cpu, gb.timer, gb.mmu, gb.ppu
+    st, mv, rv, dv = gb._burst
+    st[:8] = cpu.reg
+    st[8:23] = (cpu.pc, cpu.sp, cpu._fz, cpu._fn, cpu._fh, cpu._fc, t.div, t.tima,
+                t._bit if t._enabled else -1, gb.cart.rom1_bank << 14,
+                m.IF, m.IE, p.lcdc, p.stat, p.ly)
+    c = E._cpu_burst(st, mv, rv, dv, budget)
+    s = st.tolist(); cpu.reg[:] = s[:8]
+    cpu.pc, cpu.sp, cpu._fz, cpu._fn, cpu._fh, cpu._fc, t.div, t.tima = s[8:16]
+    if s[E._S_EXIT] == E._X_TIMA: t._of = True; t._of_d = 4
+    cpu.cycles += c
+    return c
+
+
+@needs_numba
+@pytest.mark.parametrize("seed", range(4))
+def test_cpu_kernel_single_instructions(seed):
+    # random opcode and operands at a random PC (ROM, WRAM, HRAM, VRAM),
+    # random registers, pointers into every region and a live timer: the
+    # kernel runs what it can within the budget, CPU.step must get the
+    # same machine from the same number of cycles
+    r = random.Random(seed); base = random_rom(99)
+    for _ in range(400):
+        code = bytes(r.getrandbits(8) for _ in range(12))
+        if r.random() < 0.25: code = b"\xCB" + code[1:]    # CB ops are a second table
+        pc = r.choice((r.randrange(0x150, 0x3FF0), r.randrange(0x4000, 0x7FF0),
+                       r.randrange(0xC000, 0xC3F0), r.randrange(0xFF80, 0xFFF0),
+                       r.randrange(0x8000, 0x8100)))
+        hl = r.choice((r.randrange(0xC000, 0xC400), r.randrange(0x8000, 0x9900),
+                       r.randrange(0xE000, 0xE400), r.randrange(0xFE00, 0xFEA0),
+                       r.randrange(0xFF00, 0x10000)))
+        sp = r.choice((r.randrange(0xC100, 0xC3F0), r.randrange(0xFF82, 0x10000), r.randrange(0x10000)))
+        regs = [r.getrandbits(8) for _ in range(8)]; regs[E.H] = hl >> 8; regs[E.L] = hl & 0xFF
+        f = r.getrandbits(4) << 4; bank = r.randrange(1, 4); fill = r.random()
+        tac = r.randrange(8); div = r.getrandbits(16); tima = r.choice((0xFE, 0xFF, r.getrandbits(8)))
+        budget = r.randrange(80)
+        rom = bytearray(base); rom[0x147] = 1
+        if pc < 0x8000:
+            o = pc if pc < 0x4000 else bank * 0x4000 + pc - 0x4000
+            rom[o:o+12] = code
+        gbs = []
+        for _ in range(2):
+            gb = E.GameBoy(); gb.load(bytes(rom)); m = gb.mmu
+            m.wb(0x2000, bank)
+            rr = random.Random(fill)
+            for lo, hi in ((0xC000, 0xC400), (0x8000, 0x9900), (0xFE00, 0xFEA0), (0xFF80, 0xFFFF)):
+                for a in range(lo, hi): m.wb(a, rr.getrandbits(8))
+            if pc >= 0x8000:
+                for i, b in enumerate(code): m.wb((pc + i) & 0xFFFF, b)
+            m.IE = 0; m.IF = 0xE1
+            gb.timer.write(0xFF07, tac); gb.timer.div = div; gb.timer.tima = tima
+            cpu = gb.cpu; cpu.reg[:] = regs; cpu._set_f(f); cpu.pc = pc; cpu.sp = sp
+            gb.ppu._tile_dirty[:] = bytes(384)
+            gbs.append(gb)
+        ref, gb = gbs
+        c = _burst(gb, budget)
+        while ref.cpu.cycles < c:
+            before = ref.cpu.cycles; ref.cpu.step()
+            if ref.timer.step(ref.cpu.cycles - before): ref.mmu.IF |= E.INT_TIMER
+        a, b = state(ref), state(gb)
+        bad = [key for key in a if a[key] != b[key]]
+        if bytes(ref.ppu._tile_dirty) != bytes(gb.ppu._tile_dirty): bad.append("tile_dirty")
+        assert not bad, f"code {code[:3].hex()} at {pc:04X}, budget {budget}: {bad}"